@@ -156,7 +156,7 @@ async def request_analysis(
 
         # Trigger background processing
         if settings.WORKER_MODE == "fastapi":
-            background_tasks.add_task(process_analysis_task, analysis_id)
+            background_tasks.add_task(process_analysis_task, analysis_id, analysis, document)
             logger.info(f"Added analysis task to BackgroundTasks for {analysis_id}")
 
         elif settings.WORKER_MODE == "lambda":
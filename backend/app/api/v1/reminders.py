@@ -21,6 +21,9 @@ Testing:
       }'
 
 AWS Deployment Notes:
+    - With REMINDER_QUEUE_URL set, reminders due within 15 minutes (the SQS delay
+      limit) are enqueued with a delay and the Lambda's sqs_handler sends them on
+      time; later reminders are left to the scan
     - EventBridge rule triggers Lambda every 5 minutes to check pending reminders
     - Notifications sent via SES (email) or SNS (SMS)
 """
@@ -28,11 +31,13 @@ AWS Deployment Notes:
 from fastapi import APIRouter, HTTPException, status, Query
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel, Field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+import json
 import logging
 import shortuuid
 
 from app.config import settings
+from app.services.aws import get_client, run_aws
 from app.services.db import DatabaseService
 from app.models.reminder import Reminder, ReminderStatus
 
@@ -42,6 +47,9 @@ router = APIRouter()
 # Initialize services
 db_service = DatabaseService()
 
+# SQS message delay limit
+_SQS_MAX_DELAY_SECONDS = 900
+
 
 # =============================================================================
 # REQUEST/RESPONSE MODELS
@@ -98,6 +106,54 @@ class CalendarResponse(BaseModel):
     items: List[CalendarItem]
 
 
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+async def _enqueue_reminder(reminder: Reminder) -> None:
+    """
+    Schedule a soon-due reminder on the SQS reminder queue
+
+    Only reminders due within the 15 minute SQS delay limit are enqueued,
+    delayed until they are due; anything later is left to the scheduled
+    scan rather than hopping through the queue every 15 minutes. The
+    Lambda re-reads the reminder from DynamoDB and drops messages whose
+    reminder_date no longer matches, so edits and cancellations are
+    honoured, and claims the reminder before sending so the scan won't
+    send it again. Failures are logged only: the scan still picks it up.
+
+    Args:
+        reminder: Saved reminder
+    """
+    # No queue configured: the scheduled scan handles every reminder
+    if not settings.REMINDER_QUEUE_URL:
+        return
+
+    due = reminder.reminder_date
+    if due.tzinfo is not None:
+        due = due.astimezone(timezone.utc).replace(tzinfo=None)
+    delay = int((due - datetime.utcnow()).total_seconds())
+
+    if delay > _SQS_MAX_DELAY_SECONDS:
+        return
+
+    try:
+        sqs = get_client('sqs')
+        await run_aws(
+            sqs.send_message,
+            QueueUrl=settings.REMINDER_QUEUE_URL,
+            MessageBody=json.dumps({
+                'reminder_id': reminder.reminder_id,
+                'reminder_date': reminder.reminder_date.isoformat(),
+            }),
+            DelaySeconds=max(0, delay),
+        )
+        logger.info(f"Enqueued reminder {reminder.reminder_id} (due in {delay}s)")
+
+    except Exception as e:
+        logger.warning(f"Failed to enqueue reminder {reminder.reminder_id}: {e}")
+
+
 # =============================================================================
 # ENDPOINTS
 # =============================================================================
@@ -154,6 +210,7 @@ async def create_reminder(
         )
 
         await db_service.save_reminder(reminder)
+        await _enqueue_reminder(reminder)
 
         logger.info(f"Reminder created: {reminder_id}")
 
@@ -374,6 +431,11 @@ async def update_reminder(
     try:
         await db_service.update_reminder(reminder)
 
+        # Rescheduled: queue a message for the new date if it is soon (the
+        # Lambda drops any old one since its reminder_date no longer matches)
+        if request.reminder_date is not None:
+            await _enqueue_reminder(reminder)
+
         logger.info(f"Reminder updated: {reminder_id}")
 
         return ReminderResponse(
@@ -227,8 +227,8 @@ async def export_pdf(
         )
 
     # Check if PDF already exists
-    if document.pdf_key and await storage_service.file_exists(document.pdf_key):
-        pdf_url = await storage_service.get_presigned_url(document.pdf_key)
+    if document.pdf_key and await storage_service.pdf_exists(document.pdf_key):
+        pdf_url = await storage_service.get_pdf_url(document.pdf_key)
         return PDFExportResponse(
             document_id=doc_id,
             pdf_url=pdf_url,
@@ -261,7 +261,7 @@ async def export_pdf(
         logger.info(f"PDF generated and saved: {pdf_key}")
 
         # Get presigned URL for download
-        download_url = await storage_service.get_presigned_url(pdf_key)
+        download_url = await storage_service.get_pdf_url(pdf_key)
 
         return PDFExportResponse(
             document_id=doc_id,
@@ -317,7 +317,7 @@ async def download_file(
                     detail="PDF not generated yet. Use /export/pdf endpoint first."
                 )
 
-            url = await storage_service.get_presigned_url(document.pdf_key)
+            url = await storage_service.get_pdf_url(document.pdf_key)
             return RedirectResponse(url=url)
 
         elif file_type == "original":
@@ -32,9 +32,12 @@ AWS Deployment Notes:
 """
 
 from fastapi import APIRouter, File, UploadFile, HTTPException, BackgroundTasks, status
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 from pydantic import BaseModel, Field
+import asyncio
+import hashlib
 import logging
+import mimetypes
 from datetime import datetime
 import shortuuid
 
@@ -53,6 +56,15 @@ storage_service = StorageService()
 db_service = DatabaseService()
 textract_service = TextractService()
 
+# Accepted extensions, parsed once from settings
+_SUPPORTED_FORMATS = frozenset(settings.supported_formats_list)
+
+# Declared Content-Types accepted for those extensions; generic binary (what
+# some clients send for any file) is left to the extension check
+_ALLOWED_CONTENT_TYPES = frozenset(
+    {mimetypes.types_map.get(f".{fmt}") for fmt in _SUPPORTED_FORMATS} - {None}
+) | {"image/jpg", "image/x-ms-bmp", "application/octet-stream"}
+
 
 # =============================================================================
 # REQUEST/RESPONSE MODELS
@@ -121,8 +133,7 @@ async def validate_upload_files(files: List[UploadFile]) -> None:
             detail="No files provided"
         )
 
-    supported_formats = settings.supported_formats_list
-
+    # Check every file's name and declared type before touching any body
     for file in files:
         # Check file extension
         if not file.filename:
@@ -131,13 +142,21 @@ async def validate_upload_files(files: List[UploadFile]) -> None:
                 detail="File must have a filename"
             )
 
-        file_ext = file.filename.split('.')[-1].lower()
-        if file_ext not in supported_formats:
+        file_ext = file.filename.rsplit('.', 1)[-1].lower()
+        if file_ext not in _SUPPORTED_FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unsupported file format: {file_ext}. Supported: {', '.join(settings.supported_formats_list)}"
+            )
+
+        # Check declared content type
+        if file.content_type and file.content_type not in _ALLOWED_CONTENT_TYPES:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Unsupported file format: {file_ext}. Supported: {', '.join(supported_formats)}"
+                detail=f"Unsupported content type for {file.filename}: {file.content_type}"
             )
 
+    for file in files:
         # Check file size
         file.file.seek(0, 2)  # Seek to end
         file_size = file.file.tell()
@@ -156,6 +175,19 @@ async def validate_upload_files(files: List[UploadFile]) -> None:
             )
 
 
+def _digest_fileobj(fileobj: BinaryIO) -> str:
+    """
+    Content digest of an uploaded file, leaving it rewound
+    (blocking; run via asyncio.to_thread)
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    fileobj.seek(0)
+    for chunk in iter(lambda: fileobj.read(1 << 20), b''):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
 # =============================================================================
 # ENDPOINTS
 # =============================================================================
@@ -181,6 +213,8 @@ async def upload_images(
 
     try:
         # Generate unique document ID
+        # Unguessable: with no auth, the ID is what guards the document,
+        # its PDF and its analysis
         document_id = f"doc_{shortuuid.uuid()}"
         logger.info(f"Generated document ID: {document_id}")
 
@@ -188,25 +222,40 @@ async def upload_images(
         image_urls = []
         image_keys = []
 
-        for idx, file in enumerate(files):
+        # Identical pages (e.g. the same photo picked twice) are kept once:
+        # stored, OCR'd and counted as a single page. Digests are only needed
+        # when there is something to compare against
+        if len(files) > 1:
+            digests = await asyncio.gather(
+                *(asyncio.to_thread(_digest_fileobj, file.file) for file in files)
+            )
+        else:
+            digests = [None]
+        stored = {}
+
+        for idx, (file, digest) in enumerate(zip(files, digests)):
             logger.info(f"Processing file {idx + 1}/{len(files)}: {file.filename}")
 
-            # Read file content
-            content = await file.read()
+            if digest in stored:
+                logger.info(f"Image {idx + 1} duplicates {stored[digest]}, skipping it")
+                continue
 
-            # Generate storage key
+            # Generate storage key (numbered by stored page, so skipped
+            # duplicates leave no gaps)
             file_ext = file.filename.split('.')[-1].lower()
-            storage_key = f"{document_id}/image_{idx + 1}.{file_ext}"
+            storage_key = f"{document_id}/image_{len(image_keys) + 1}.{file_ext}"
 
-            # Save to storage (S3 or local)
-            image_url = await storage_service.save_image(
+            # Stream the spooled upload to storage (S3 or local) without reading it into memory
+            image_url = await storage_service.save_image_fileobj(
                 key=storage_key,
-                content=content,
+                fileobj=file.file,
                 content_type=file.content_type or f"image/{file_ext}"
             )
 
             image_urls.append(image_url)
             image_keys.append(storage_key)
+            if digest is not None:
+                stored[digest] = storage_key
 
             logger.info(f"Saved image {idx + 1} to: {storage_key}")
 
@@ -217,7 +266,7 @@ async def upload_images(
             uploaded_at=datetime.utcnow(),
             image_urls=image_urls,
             image_keys=image_keys,
-            image_count=len(files),
+            image_count=len(image_keys),
             ocr_status=ProcessingStatus.PENDING,
             analysis_status=ProcessingStatus.PENDING,
         )
@@ -225,11 +274,16 @@ async def upload_images(
         await db_service.save_document(document)
         logger.info(f"Document {document_id} saved to database")
 
+        duplicates = len(files) - len(image_keys)
+        message = f"Successfully uploaded {len(files)} file(s)"
+        if duplicates:
+            message += f" ({duplicates} duplicate(s) skipped)"
+
         return UploadResponse(
             document_id=document_id,
             status=DocumentStatus.UPLOADED,
             uploaded_files=len(files),
-            message=f"Successfully uploaded {len(files)} file(s). Use document_id to check status and process OCR."
+            message=f"{message}. Use document_id to check status and process OCR."
         )
 
     except Exception as e:
@@ -332,7 +386,7 @@ async def trigger_ocr_processing(
         # Trigger background processing
         if settings.WORKER_MODE == "fastapi":
             # Use FastAPI BackgroundTasks for local/dev
-            background_tasks.add_task(process_ocr_task, doc_id)
+            background_tasks.add_task(process_ocr_task, doc_id, document)
             logger.info(f"Added OCR task to BackgroundTasks for {doc_id}")
 
         elif settings.WORKER_MODE == "lambda":
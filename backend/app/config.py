@@ -54,6 +54,9 @@ class Settings(BaseSettings):
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
 
+    # Threads running blocking boto3 calls (S3/Textract)
+    AWS_IO_CONCURRENCY: int = 32
+
     # =============================================================================
     # STORAGE CONFIGURATION
     # =============================================================================
@@ -65,6 +68,8 @@ class Settings(BaseSettings):
     S3_PREFIX_PDFS: str = "pdfs/"
     S3_PREFIX_TEXTRACT: str = "textract/"
     S3_PRESIGNED_URL_EXPIRY: int = 3600  # seconds
+    S3_FORCE_SSE_HEADER: bool = False  # Send SSE-S3 per object (only if bucket default encryption is off)
+    S3_MAX_CONCURRENCY: int = 8  # Objects fetched in parallel per task
 
     # =============================================================================
     # OCR CONFIGURATION
@@ -75,11 +80,15 @@ class Settings(BaseSettings):
     TESSERACT_PATH: str = "/usr/bin/tesseract"
     TESSERACT_LANG: str = "eng"
     TESSERACT_CONFIG: str = "--oem 3 --psm 6"
+    TESSERACT_MAX_DIM: int = 3300  # Longest side in px (~300 DPI letter); 0 disables
 
     # Textract
     TEXTRACT_ASYNC: bool = True
     TEXTRACT_SNS_TOPIC_ARN: Optional[str] = None
     TEXTRACT_ROLE_ARN: Optional[str] = None
+    TEXTRACT_MAX_CONCURRENCY: int = 4  # pages OCR'd in parallel per document
+    TEXTRACT_MAX_INFLIGHT: int = 8  # Textract calls in flight across all documents
+    TEXTRACT_MAX_ATTEMPTS: int = 6  # incl. adaptive backoff retries on throttling
 
     # =============================================================================
     # LLM CONFIGURATION
@@ -97,10 +106,12 @@ class Settings(BaseSettings):
     BEDROCK_REGION: str = "us-east-1"
     BEDROCK_MAX_TOKENS: int = 4000
     BEDROCK_TEMPERATURE: float = 0.2
+    BEDROCK_MAX_CONCURRENCY: int = 8  # Bedrock calls in flight process-wide (own thread pool)
 
     # LLM Processing
     MAX_CHUNK_TOKENS: int = 4000
     SUMMARY_MAX_TOKENS: int = 1000
+    LLM_MAX_CONCURRENCY: int = 4  # Chunk summaries requested in parallel
 
     # =============================================================================
     # DATABASE CONFIGURATION
@@ -136,6 +147,9 @@ class Settings(BaseSettings):
     EVENTBRIDGE_RULE_NAME: str = "postmate-reminder-check"
     EVENTBRIDGE_SCHEDULE_RATE: str = "rate(5 minutes)"
 
+    REMINDER_MAX_CONCURRENCY: int = 10  # Due reminders sent in parallel per check
+    REMINDER_QUEUE_URL: Optional[str] = None  # SQS delay queue for reminders due within 15 min
+
     # Email/Notification
     EMAIL_PROVIDER: Literal["ses", "sendgrid", "smtp"] = "ses"
     EMAIL_FROM_ADDRESS: str = "noreply@postmate.example.com"
@@ -152,6 +166,7 @@ class Settings(BaseSettings):
     PDF_FONT_SIZE: int = 10
     PDF_PAGE_SIZE: Literal["LETTER", "A4"] = "LETTER"
     PDF_MARGIN: int = 72  # points
+    PDF_CACHE_MAX_ENTRIES: int = 32  # in-process cache of generated PDFs
 
     # =============================================================================
     # SEARCH CONFIGURATION
@@ -0,0 +1,141 @@
+"""
+PostMate Backend - Shared AWS Clients
+
+Purpose: One boto3 Session and tuned botocore Config shared by the S3, Textract and
+Bedrock services, so every service instance reuses the same credentials, endpoint data and
+keep-alive HTTPS connection pool, plus dedicated thread pools that run the blocking
+boto3 calls off the event loop.
+
+Testing:
+    from app.services.aws import get_client
+    s3 = get_client('s3')
+    assert s3 is get_client('s3')
+    await run_aws(s3.head_object, Bucket='my-bucket', Key='some/key')
+    await run_bedrock(get_client('bedrock-runtime').invoke_model, modelId=..., body=...)
+
+AWS Deployment Notes:
+    - max_pool_connections should cover AWS_IO_CONCURRENCY (threads making calls)
+    - Bedrock model calls hold a thread for tens of seconds, so they run in their
+      own pool (BEDROCK_MAX_CONCURRENCY threads) and can't starve S3/Textract I/O
+    - Adaptive retries back off client-side when AWS throttles; the token bucket lives
+      in the client, so it is shared by every caller in the process
+    - Textract gets more attempts (TEXTRACT_MAX_ATTEMPTS): throttling is routine there
+    - bedrock-runtime uses BEDROCK_REGION and a longer read timeout (model calls
+      routinely take tens of seconds)
+    - Credentials come from the IAM role unless AWS_ACCESS_KEY_ID is set
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+import boto3
+from botocore.config import Config
+
+from app.config import settings
+
+CLIENT_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+    connect_timeout=3,
+    read_timeout=30,
+)
+
+# Per-service overrides merged over CLIENT_CONFIG
+_SERVICE_CONFIGS = {
+    'textract': CLIENT_CONFIG.merge(Config(
+        retries={'max_attempts': settings.TEXTRACT_MAX_ATTEMPTS, 'mode': 'adaptive'},
+    )),
+    'bedrock-runtime': CLIENT_CONFIG.merge(Config(
+        retries={'max_attempts': 4, 'mode': 'adaptive'},
+        read_timeout=60,
+    )),
+}
+
+# Per-service region overrides (default: AWS_REGION)
+_SERVICE_REGIONS = {
+    'bedrock-runtime': settings.BEDROCK_REGION,
+}
+
+_SESSION = boto3.session.Session()
+_CLIENTS: Dict[str, Any] = {}
+_LOCK = threading.Lock()  # boto3 sessions are not thread-safe
+
+# Separate from the default executor so local file I/O and other to_thread
+# work can't starve S3/Textract calls (and vice versa); threads start lazily
+_AWS_POOL = ThreadPoolExecutor(
+    max_workers=settings.AWS_IO_CONCURRENCY,
+    thread_name_prefix='aws-io',
+)
+
+# Bedrock invocations block for the whole model call (up to the 60 s read
+# timeout); a pool of their own keeps them from occupying _AWS_POOL threads.
+# Its size is also the process-wide cap on Bedrock calls in flight.
+_BEDROCK_POOL = ThreadPoolExecutor(
+    max_workers=settings.BEDROCK_MAX_CONCURRENCY,
+    thread_name_prefix='bedrock',
+)
+
+
+def get_client(service_name: str) -> Any:
+    """
+    Get the process-wide boto3 client for an AWS service
+
+    Clients are created once from the shared session and reused
+    (boto3 clients are thread-safe).
+
+    Args:
+        service_name: boto3 service name, e.g. 's3', 'textract' or 'bedrock-runtime'
+
+    Returns:
+        boto3 client
+    """
+    client = _CLIENTS.get(service_name)
+    if client is None:
+        with _LOCK:
+            client = _CLIENTS.get(service_name)
+            if client is None:
+                client = _SESSION.client(
+                    service_name,
+                    region_name=_SERVICE_REGIONS.get(service_name, settings.AWS_REGION),
+                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+                    config=_SERVICE_CONFIGS.get(service_name, CLIENT_CONFIG),
+                )
+                _CLIENTS[service_name] = client
+    return client
+
+
+async def run_aws(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking boto3 call in the AWS I/O thread pool
+
+    Args:
+        fn: Bound client method, e.g. s3_client.get_object
+        *args, **kwargs: Arguments for the call
+
+    Returns:
+        Whatever fn returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_AWS_POOL, functools.partial(fn, *args, **kwargs))
+
+
+async def run_bedrock(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a blocking Bedrock call in the Bedrock thread pool
+
+    Like run_aws, but kept apart from S3/Textract I/O (see _BEDROCK_POOL).
+
+    Args:
+        fn: Blocking callable, e.g. bedrock_client.invoke_model
+        *args, **kwargs: Arguments for the call
+
+    Returns:
+        Whatever fn returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_BEDROCK_POOL, functools.partial(fn, *args, **kwargs))
@@ -19,6 +19,7 @@ AWS Deployment Notes:
 """
 
 import logging
+from enum import Enum
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 import boto3
@@ -133,6 +134,54 @@ class DatabaseService:
             logger.error(f"Failed to update document: {e}")
             raise
 
+    async def update_document_fields(self, document_id: str, **fields: Any) -> bool:
+        """
+        Set specific document attributes in one UpdateItem
+
+        Unlike update_document this doesn't rewrite the whole item (including
+        ocr_text), needs no prior read, and leaves attributes written
+        concurrently by other tasks alone.
+
+        Args:
+            document_id: Document to update
+            **fields: Attribute name -> value (datetimes, floats and enums are
+                stored the same way as in Document.to_dynamodb_item)
+
+        Returns:
+            True if updated, False if the document doesn't exist
+        """
+        names = {}
+        values = {}
+        assignments = []
+        for i, (field, value) in enumerate(fields.items()):
+            if isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, Enum):
+                value = value.value
+            elif isinstance(value, float):
+                value = str(value)  # DynamoDB doesn't support float
+            names[f'#f{i}'] = field
+            values[f':v{i}'] = value
+            assignments.append(f'#f{i} = :v{i}')
+
+        try:
+            self.documents_table.update_item(
+                Key={'document_id': document_id},
+                UpdateExpression='SET ' + ', '.join(assignments),
+                ConditionExpression='attribute_exists(document_id)',
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+            logger.info(f"Updated document fields: {document_id} ({', '.join(fields)})")
+            return True
+
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                logger.warning(f"Document not found for update: {document_id}")
+                return False
+            logger.error(f"Failed to update document: {e}")
+            raise
+
     async def search_documents(
         self,
         query: Optional[str] = None,
@@ -21,17 +21,101 @@ AWS Deployment Notes:
 """
 
 import logging
+import asyncio
+import hashlib
 import json
-from typing import Dict, List, Optional, Any
-import boto3
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
+import orjson
 from botocore.exceptions import ClientError
 from openai import AsyncOpenAI
 import tiktoken
 
 from app.config import settings
+from app.services.aws import get_client, run_bedrock
 
 logger = logging.getLogger(__name__)
 
+# Fenced (```json / ```) object first, otherwise the outermost bare object
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```", re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+# Paragraph breaks (blank lines) and sentence boundaries for chunking
+_PARA_RE = re.compile(r'\n{2,}')
+_SENT_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Upper bound on memoised summary merges kept per LLMService
+_MERGE_CACHE_MAX_ENTRIES = 256
+
+# Prompt templates live here; edits need a restart (see _read_prompt_template)
+_PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "..", "prompts")
+
+# Used when a template file is missing
+_DEFAULT_PROMPTS = {
+    "analysis_prompt.txt": """Analyze the following document and return ONLY a JSON object (no markdown, no explanation):
+
+{OCR_TEXT}
+
+Return JSON in this exact format:
+{
+  "category": "invoice|receipt|letter|other",
+  "confidence": 0.95,
+  "summary": "Brief 1-2 sentence summary",
+  "key_entities": {
+    "date": "YYYY-MM-DD or null",
+    "total_amount": "$XX.XX or null",
+    "vendor": "Company name or null",
+    "recipient": "Recipient name or null"
+  },
+  "suggested_tags": ["tag1", "tag2"]
+}""",
+    "chat_prompt.txt": """You are a helpful assistant answering questions about a document.
+
+Document content:
+{CONTEXT}
+
+Answer questions accurately based on the document content. If information is not in the document, say so.""",
+    "summary_prompt.txt": """Summarize the following text concisely, preserving key information:
+
+{TEXT}
+
+Summary:""",
+}
+
+
+@lru_cache(maxsize=None)
+def _read_prompt_template(filename: str) -> str:
+    """
+    Read a prompt template from app/prompts, falling back to the default
+
+    Cached: templates ship with the code, so each file is read once per
+    process instead of on every analysis/chat request.
+    """
+    try:
+        with open(os.path.join(_PROMPTS_DIR, filename), 'r', encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        logger.warning(f"Prompt template {filename} not found, using default")
+        return _DEFAULT_PROMPTS.get(filename, "")
+
+
+def _paragraph_spans(text: str) -> List[Tuple[int, int, int]]:
+    """
+    Get (start, end, separator_end) offsets of each paragraph in text
+
+    Offsets come from a single regex scan; no substrings are created.
+    """
+    spans = []
+    pos = 0
+    for match in _PARA_RE.finditer(text):
+        spans.append((pos, match.start(), match.end()))
+        pos = match.end()
+    spans.append((pos, len(text), len(text)))
+    return spans
+
 
 class LLMService:
     """
@@ -42,12 +126,8 @@ class LLMService:
         self.provider = settings.LLM_PROVIDER
 
         if self.provider == "bedrock":
-            self.bedrock_client = boto3.client(
-                'bedrock-runtime',
-                region_name=settings.BEDROCK_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            )
+            # Process-wide client from the shared session (app.services.aws)
+            self.bedrock_client = get_client('bedrock-runtime')
             self.model_id = settings.BEDROCK_MODEL_ID
             logger.info(f"LLM: Using AWS Bedrock ({self.model_id})")
 
@@ -56,6 +136,9 @@ class LLMService:
             self.model_id = settings.OPENAI_MODEL
             logger.info(f"LLM: Using OpenAI ({self.model_id})")
 
+        # LRU of merged summaries keyed by content hash (see _merge_summaries)
+        self._merge_cache: "OrderedDict[str, str]" = OrderedDict()
+
         # Initialize tokenizer for chunking
         try:
             self.tokenizer = tiktoken.encoding_for_model("gpt-4")
@@ -96,7 +179,7 @@ class LLMService:
             Structured analysis as dict
         """
         # Handle long documents with chunking
-        if self._count_tokens(ocr_text) > settings.MAX_CHUNK_TOKENS:
+        if not self._fits_in_tokens(ocr_text, settings.MAX_CHUNK_TOKENS):
             logger.info("Document too long, using chunking + summarization")
             ocr_text = await self.chunk_and_summarize(
                 ocr_text,
@@ -155,7 +238,7 @@ class LLMService:
             Answer text
         """
         # Handle long context
-        if self._count_tokens(context) > settings.MAX_CHUNK_TOKENS:
+        if not self._fits_in_tokens(context, settings.MAX_CHUNK_TOKENS):
             logger.info("Context too long, summarizing")
             context = await self.chunk_and_summarize(
                 context,
@@ -199,9 +282,13 @@ class LLMService:
 
         Algorithm:
         1. Split text into chunks that fit within max_tokens
-        2. Summarize each chunk individually
-        3. Combine summaries into final text
-        4. If combined summary still too long, recursively summarize
+        2. Summarize each chunk individually (up to LLM_MAX_CONCURRENCY
+           requests in flight)
+        3. While the combined summaries are too long, merge adjacent pairs
+           (one LLM call per pair, pairs run concurrently under the same
+           LLM_MAX_CONCURRENCY limit); this halves the summary count per
+           round, so it finishes in at most log2(N) rounds
+        4. Combine summaries into final text
 
         Args:
             text: Long text to summarize
@@ -210,37 +297,84 @@ class LLMService:
         Returns:
             Summarized text that fits within token limit
         """
-        logger.info(f"Chunking text: {self._count_tokens(text)} tokens")
+        logger.info(f"Chunking text: {len(text)} characters")
 
-        # Split into chunks
-        chunks = self._split_into_chunks(text, max_tokens)
+        # Split into chunks (tokenizing a long text is CPU-bound)
+        chunks = await asyncio.to_thread(self._split_into_chunks, text, max_tokens)
         logger.info(f"Split into {len(chunks)} chunks")
 
-        # Summarize each chunk
-        summaries = []
+        # Summarize chunks concurrently; gather keeps them in document order
         prompt_template = self._load_prompt_template("summary_prompt.txt")
+        semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
 
-        for idx, chunk in enumerate(chunks, 1):
-            logger.info(f"Summarizing chunk {idx}/{len(chunks)}")
+        async def summarize(idx: int, chunk: str) -> str:
+            async with semaphore:
+                logger.info(f"Summarizing chunk {idx}/{len(chunks)}")
+                return await self._call_llm(prompt_template.replace("{TEXT}", chunk))
 
-            prompt = prompt_template.replace("{TEXT}", chunk)
-            summary = await self._call_llm(prompt)
-            summaries.append(summary)
+        summaries = list(await asyncio.gather(
+            *(summarize(idx, chunk) for idx, chunk in enumerate(chunks, 1))
+        ))
+
+        # Reduce tree: merge adjacent pairs until the combined text fits
+        round_num = 0
+        while len(summaries) > 1 and not self._fits_in_tokens("\n\n".join(summaries), max_tokens):
+            round_num += 1
+            logger.info(f"Combined summary too long, merging {len(summaries)} summaries (round {round_num})")
+
+            pairs = [summaries[i:i + 2] for i in range(0, len(summaries), 2)]
+            summaries = list(await asyncio.gather(
+                *(self._merge_summaries(pair, prompt_template, semaphore) for pair in pairs)
+            ))
 
         # Combine summaries
         combined = "\n\n".join(summaries)
 
-        # If still too long, recursively summarize
-        if self._count_tokens(combined) > max_tokens:
-            logger.info("Combined summary still too long, recursing")
-            return await self.chunk_and_summarize(combined, max_tokens)
+        if len(summaries) == 1 and not self._fits_in_tokens(combined, max_tokens):
+            logger.warning("Single merged summary still exceeds token budget")
 
         return combined
 
+    async def _merge_summaries(
+        self,
+        pair: List[str],
+        prompt_template: str,
+        semaphore: asyncio.Semaphore
+    ) -> str:
+        """
+        Merge one or two adjacent summaries with a single LLM call
+
+        Results are memoised by content hash so retries of the same
+        document do not re-merge identical pairs. The LLM call waits on
+        semaphore, the limit shared with the chunk summaries.
+        """
+        if len(pair) == 1:
+            return pair[0]
+
+        text = "\n\n".join(pair)
+        cache_key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+        cached = self._merge_cache.get(cache_key)
+        if cached is not None:
+            self._merge_cache.move_to_end(cache_key)
+            return cached
+
+        async with semaphore:
+            merged = await self._call_llm(prompt_template.replace("{TEXT}", text))
+
+        self._merge_cache[cache_key] = merged
+        while len(self._merge_cache) > _MERGE_CACHE_MAX_ENTRIES:
+            self._merge_cache.popitem(last=False)
+
+        return merged
+
     def _split_into_chunks(self, text: str, max_tokens: int) -> List[str]:
         """
         Split text into chunks by token count
 
+        Chunks are slices of the original text between segment offsets, so
+        paragraph/sentence separators are kept and nothing is re-joined.
+
         Args:
             text: Text to split
             max_tokens: Max tokens per chunk
@@ -248,52 +382,81 @@ class LLMService:
         Returns:
             List of text chunks
         """
-        # Split by paragraphs first
-        paragraphs = text.split('\n\n')
+        if self._fits_in_tokens(text, max_tokens):
+            return [text]
 
         chunks = []
-        current_chunk = []
+        chunk_start = 0
+        chunk_end = 0
         current_tokens = 0
+        in_chunk = False
 
-        for para in paragraphs:
-            para_tokens = self._count_tokens(para)
+        for seg_start, seg_end, seg_tokens in self._iter_segments(text, max_tokens):
+            if current_tokens + seg_tokens > max_tokens and in_chunk:
+                # Save current chunk
+                chunks.append(text[chunk_start:chunk_end])
+                current_tokens = 0
+                in_chunk = False
 
-            # If single paragraph exceeds limit, split by sentences
-            if para_tokens > max_tokens:
-                sentences = para.split('. ')
-                for sentence in sentences:
-                    sent_tokens = self._count_tokens(sentence)
+            if not in_chunk:
+                chunk_start = seg_start
+                in_chunk = True
 
-                    if current_tokens + sent_tokens > max_tokens and current_chunk:
-                        # Save current chunk
-                        chunks.append('\n\n'.join(current_chunk))
-                        current_chunk = []
-                        current_tokens = 0
+            chunk_end = seg_end
+            current_tokens += seg_tokens
 
-                    current_chunk.append(sentence)
-                    current_tokens += sent_tokens
+        # Add final chunk
+        if in_chunk:
+            chunks.append(text[chunk_start:chunk_end])
 
-            else:
-                # Add paragraph to current chunk
-                if current_tokens + para_tokens > max_tokens and current_chunk:
-                    # Save current chunk
-                    chunks.append('\n\n'.join(current_chunk))
-                    current_chunk = []
-                    current_tokens = 0
+        return chunks
 
-                current_chunk.append(para)
-                current_tokens += para_tokens
+    def _iter_segments(self, text: str, max_tokens: int):
+        """
+        Yield (start, end, tokens) for each paragraph of text, or for each
+        sentence of a paragraph that alone exceeds max_tokens
 
-        # Add final chunk
-        if current_chunk:
-            chunks.append('\n\n'.join(current_chunk))
+        ``end`` excludes the trailing separator; ``tokens`` counts it, so
+        a chunk's token total never undercounts the slice it covers.
+        """
+        spans = _paragraph_spans(text)
 
-        return chunks
+        # One batched call counts every paragraph; tiktoken encodes the
+        # batch across threads with the GIL released
+        encoded = self.tokenizer.encode_ordinary_batch(
+            [text[start:sep_end] for start, _, sep_end in spans],
+            num_threads=os.cpu_count() or 1,
+        )
+
+        for (para_start, para_end, sep_end), tokens in zip(spans, encoded):
+            para_tokens = len(tokens)
+
+            # If single paragraph exceeds limit, split by sentences
+            if para_tokens > max_tokens:
+                sent_start = para_start
+                for match in _SENT_RE.finditer(text, para_start, para_end):
+                    # Sentence keeps its punctuation; the whitespace is the separator
+                    yield sent_start, match.start(), self._count_tokens(text[sent_start:match.end()])
+                    sent_start = match.end()
+                yield sent_start, para_end, self._count_tokens(text[sent_start:sep_end])
+            else:
+                yield para_start, para_end, para_tokens
 
     def _count_tokens(self, text: str) -> int:
         """Count tokens in text"""
         return len(self.tokenizer.encode(text))
 
+    def _fits_in_tokens(self, text: str, budget: int) -> bool:
+        """
+        Check whether text fits in a token budget
+
+        Every BPE token covers at least one UTF-8 byte, so the byte length
+        is an upper bound on the token count; short text skips encoding.
+        """
+        if len(text) <= budget and len(text.encode('utf-8')) <= budget:
+            return True
+        return self._count_tokens(text) <= budget
+
     # =========================================================================
     # LLM API CALLS
     # =========================================================================
@@ -333,6 +496,21 @@ class LLMService:
     # BEDROCK IMPLEMENTATION
     # =========================================================================
 
+    def _invoke_bedrock(self, request_body: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Invoke the model and read the response body
+
+        Both block for the whole model call, so this runs in the Bedrock
+        thread pool (run_bedrock): concurrent chunk summaries overlap, the
+        event loop keeps serving other requests, and S3/Textract I/O keeps
+        its own threads.
+        """
+        response = self.bedrock_client.invoke_model(
+            modelId=self.model_id,
+            body=orjson.dumps(request_body)
+        )
+        return orjson.loads(response['body'].read())
+
     async def _call_bedrock(self, prompt: str) -> str:
         """Call AWS Bedrock with prompt"""
         try:
@@ -349,13 +527,9 @@ class LLMService:
                 ]
             }
 
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body)
-            )
+            response_body = await run_bedrock(self._invoke_bedrock, request_body)
 
             # Parse response
-            response_body = json.loads(response['body'].read())
             text = response_body['content'][0]['text']
 
             return text
@@ -388,13 +562,9 @@ class LLMService:
             if system_message:
                 request_body["system"] = system_message
 
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(request_body)
-            )
+            response_body = await run_bedrock(self._invoke_bedrock, request_body)
 
             # Parse response
-            response_body = json.loads(response['body'].read())
             text = response_body['content'][0]['text']
 
             return text
@@ -448,60 +618,12 @@ class LLMService:
     # =========================================================================
 
     def _load_prompt_template(self, filename: str) -> str:
-        """Load prompt template from file"""
-        import os
-
-        template_path = os.path.join(
-            os.path.dirname(__file__),
-            "..",
-            "prompts",
-            filename
-        )
-
-        try:
-            with open(template_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        except FileNotFoundError:
-            logger.warning(f"Prompt template {filename} not found, using default")
-            return self._get_default_prompt(filename)
+        """Load prompt template from file (read once per process)"""
+        return _read_prompt_template(filename)
 
     def _get_default_prompt(self, filename: str) -> str:
         """Get default prompt if template file not found"""
-        if filename == "analysis_prompt.txt":
-            return """Analyze the following document and return ONLY a JSON object (no markdown, no explanation):
-
-{OCR_TEXT}
-
-Return JSON in this exact format:
-{
-  "category": "invoice|receipt|letter|other",
-  "confidence": 0.95,
-  "summary": "Brief 1-2 sentence summary",
-  "key_entities": {
-    "date": "YYYY-MM-DD or null",
-    "total_amount": "$XX.XX or null",
-    "vendor": "Company name or null",
-    "recipient": "Recipient name or null"
-  },
-  "suggested_tags": ["tag1", "tag2"]
-}"""
-
-        elif filename == "chat_prompt.txt":
-            return """You are a helpful assistant answering questions about a document.
-
-Document content:
-{CONTEXT}
-
-Answer questions accurately based on the document content. If information is not in the document, say so."""
-
-        elif filename == "summary_prompt.txt":
-            return """Summarize the following text concisely, preserving key information:
-
-{TEXT}
-
-Summary:"""
-
-        return ""
+        return _DEFAULT_PROMPTS.get(filename, "")
 
     def _extract_json_from_response(self, response: str) -> Dict:
         """
@@ -513,11 +635,15 @@ Summary:"""
         Returns:
             Parsed JSON dict
         """
-        # Remove markdown code blocks if present
-        if "```json" in response:
-            response = response.split("```json")[1].split("```")[0].strip()
-        elif "```" in response:
-            response = response.split("```")[1].split("```")[0].strip()
-
-        # Parse JSON
-        return json.loads(response)
+        # A fenced block wins even when prose before it contains braces;
+        # otherwise take the outermost bare object
+        match = _JSON_FENCE_RE.search(response)
+        if match:
+            response = match.group(1)
+        else:
+            match = _JSON_OBJECT_RE.search(response)
+            if match:
+                response = match.group(0)
+
+        # Parse JSON (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+        return orjson.loads(response)
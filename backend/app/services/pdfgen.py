@@ -14,13 +14,19 @@ AWS Deployment Notes:
 """
 
 import logging
-from typing import Optional
-from datetime import datetime
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Iterator, Optional
 import io
 
+import orjson
+
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image as RLImage, PageBreak, Table, TableStyle
+from reportlab.platypus import (
+    BaseDocTemplate, Frame, PageTemplate, Paragraph, Spacer, Image as RLImage, PageBreak, Table, TableStyle
+)
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 from reportlab.lib import colors
@@ -32,6 +38,46 @@ from app.models.analysis import Analysis
 logger = logging.getLogger(__name__)
 
 
+def _build_styles():
+    """Build the shared style sheet with custom paragraph styles"""
+    styles = getSampleStyleSheet()
+
+    # Title style
+    styles.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#2C3E50'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+    ))
+
+    # Section header style
+    styles.add(ParagraphStyle(
+        name='SectionHeader',
+        parent=styles['Heading2'],
+        fontSize=14,
+        textColor=colors.HexColor('#34495E'),
+        spaceAfter=12,
+        spaceBefore=12,
+    ))
+
+    # Body text style
+    styles.add(ParagraphStyle(
+        name='BodyText',
+        parent=styles['Normal'],
+        fontSize=settings.PDF_FONT_SIZE,
+        alignment=TA_JUSTIFY,
+        spaceAfter=12,
+    ))
+
+    return styles
+
+
+# Styles are read-only once built, so build them once per process
+_STYLES = _build_styles()
+
+
 class PDFGenService:
     """
     PDF generation service for creating annotated document exports
@@ -40,39 +86,10 @@ class PDFGenService:
     def __init__(self):
         self.page_size = letter if settings.PDF_PAGE_SIZE == "LETTER" else A4
         self.margin = settings.PDF_MARGIN
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
-
-    def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        # Title style
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#2C3E50'),
-            spaceAfter=30,
-            alignment=TA_CENTER,
-        ))
+        self.styles = _STYLES
 
-        # Section header style
-        self.styles.add(ParagraphStyle(
-            name='SectionHeader',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#34495E'),
-            spaceAfter=12,
-            spaceBefore=12,
-        ))
-
-        # Body text style
-        self.styles.add(ParagraphStyle(
-            name='BodyText',
-            parent=self.styles['Normal'],
-            fontSize=settings.PDF_FONT_SIZE,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12,
-        ))
+        # LRU of generated PDFs keyed by content hash (see _pdf_cache_key)
+        self._pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
 
     async def generate_pdf(
         self,
@@ -91,13 +108,86 @@ class PDFGenService:
         Returns:
             PDF bytes
         """
+        cache_key = self._pdf_cache_key(document, analysis, include_images)
+        cached = self._pdf_cache.get(cache_key)
+        if cached is not None:
+            self._pdf_cache.move_to_end(cache_key)
+            logger.info(f"PDF cache hit for document {document.document_id}")
+            return cached
+
         logger.info(f"Generating PDF for document {document.document_id}")
 
-        # Create PDF buffer
-        buffer = io.BytesIO()
+        # ReportLab layout is synchronous CPU work; keep it off the event loop
+        pdf_bytes = await asyncio.to_thread(
+            self._build_pdf_sync, document, analysis, include_images
+        )
+
+        logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
+
+        if settings.PDF_CACHE_MAX_ENTRIES > 0:
+            self._pdf_cache[cache_key] = pdf_bytes
+            while len(self._pdf_cache) > settings.PDF_CACHE_MAX_ENTRIES:
+                self._pdf_cache.popitem(last=False)
+
+        return pdf_bytes
+
+    @staticmethod
+    def _pdf_cache_key(
+        document: Document,
+        analysis: Optional[Analysis],
+        include_images: bool
+    ) -> str:
+        """
+        Stable hash of every field rendered into the PDF
 
-        # Create document
-        doc = SimpleDocTemplate(
+        Must list each field the story builders read, so an update to any
+        of them (e.g. a re-run OCR changing ocr_confidence) renders anew.
+        Fields that are not rendered (pdf_key, pdf_url, ...) are left out
+        so saving the PDF doesn't invalidate it.
+        """
+        rendered = [
+            document.document_id,
+            document.uploaded_at,
+            document.processed_at,
+            document.page_count,
+            document.image_count,
+            document.ocr_status,
+            document.ocr_confidence,
+            document.ocr_text,
+            document.image_urls,
+            include_images,
+        ]
+        if analysis:
+            rendered += [
+                analysis.completed_at,
+                analysis.category,
+                analysis.confidence,
+                analysis.summary,
+                analysis.key_entities,
+                analysis.suggested_tags,
+            ]
+        payload = orjson.dumps(rendered, default=str, option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(payload).hexdigest()
+
+    def _build_pdf_sync(
+        self,
+        document: Document,
+        analysis: Optional[Analysis],
+        include_images: bool
+    ) -> bytes:
+        """Build annotated PDF synchronously (runs in a worker thread)"""
+        with io.BytesIO() as buffer:
+            # Create document and build content
+            doc = self._create_doc_template(buffer)
+            doc.build(list(self._iter_story(document, analysis, include_images)))
+
+            # getvalue() hands over the buffer's own bytes object when no
+            # views are exported, so this does not copy the PDF
+            return buffer.getvalue()
+
+    def _create_doc_template(self, buffer: io.BytesIO) -> BaseDocTemplate:
+        """Create a single-frame document template writing into buffer"""
+        doc = BaseDocTemplate(
             buffer,
             pagesize=self.page_size,
             rightMargin=self.margin,
@@ -105,38 +195,40 @@ class PDFGenService:
             topMargin=self.margin,
             bottomMargin=self.margin,
         )
+        frame = Frame(
+            doc.leftMargin,
+            doc.bottomMargin,
+            doc.width,
+            doc.height,
+            id='body',
+        )
+        doc.addPageTemplates([PageTemplate(id='main', frames=[frame])])
+        return doc
 
-        # Build content
-        story = []
-
+    def _iter_story(
+        self,
+        document: Document,
+        analysis: Optional[Analysis],
+        include_images: bool
+    ) -> Iterator:
+        """Yield the report flowables in order"""
         # Title page
-        story.extend(self._build_title_page(document, analysis))
-        story.append(PageBreak())
+        yield from self._build_title_page(document, analysis)
+        yield PageBreak()
 
         # Analysis section
         if analysis:
-            story.extend(self._build_analysis_section(analysis))
-            story.append(PageBreak())
+            yield from self._build_analysis_section(analysis)
+            yield PageBreak()
 
         # OCR text section
         if document.ocr_text:
-            story.extend(self._build_ocr_section(document))
-            story.append(PageBreak())
+            yield from self._iter_ocr_section(document)
+            yield PageBreak()
 
         # Images section
         if include_images and document.image_urls:
-            story.extend(self._build_images_section(document))
-
-        # Build PDF
-        doc.build(story)
-
-        # Get PDF bytes
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
-
-        logger.info(f"PDF generated: {len(pdf_bytes)} bytes")
-
-        return pdf_bytes
+            yield from self._build_images_section(document)
 
     def _build_title_page(self, document: Document, analysis: Optional[Analysis]) -> list:
         """Build title page content"""
@@ -174,9 +266,17 @@ class PDFGenService:
         elements.append(table)
         elements.append(Spacer(1, 0.5 * inch))
 
-        # Generation timestamp
+        # Timestamp of the newest data in the report (not the render time,
+        # so a cached PDF is identical to a fresh one)
+        as_of = max(
+            t for t in (
+                document.uploaded_at,
+                document.processed_at,
+                analysis.completed_at if analysis else None,
+            ) if t is not None
+        )
         elements.append(Paragraph(
-            f"Generated: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}",
+            f"Data as of: {as_of.strftime('%Y-%m-%d %H:%M:%S UTC')}",
             self.styles['Normal']
         ))
 
@@ -223,20 +323,18 @@ class PDFGenService:
 
         return elements
 
-    def _build_ocr_section(self, document: Document) -> list:
-        """Build OCR text section"""
-        elements = []
-
-        elements.append(Paragraph("Extracted Text (OCR)", self.styles['CustomTitle']))
-        elements.append(Spacer(1, 0.3 * inch))
+    def _iter_ocr_section(self, document: Document) -> Iterator:
+        """Yield OCR text section flowables, one paragraph at a time"""
+        yield Paragraph("Extracted Text (OCR)", self.styles['CustomTitle'])
+        yield Spacer(1, 0.3 * inch)
 
         # OCR confidence
         if document.ocr_confidence:
-            elements.append(Paragraph(
+            yield Paragraph(
                 f"OCR Confidence: {document.ocr_confidence:.1f}%",
                 self.styles['Normal']
-            ))
-            elements.append(Spacer(1, 0.2 * inch))
+            )
+            yield Spacer(1, 0.2 * inch)
 
         # OCR text
         # Split into paragraphs and escape HTML
@@ -246,9 +344,7 @@ class PDFGenService:
             if para.strip():
                 # Escape HTML entities
                 para_escaped = para.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                elements.append(Paragraph(para_escaped, self.styles['BodyText']))
-
-        return elements
+                yield Paragraph(para_escaped, self.styles['BodyText'])
 
     def _build_images_section(self, document: Document) -> list:
         """Build images section"""
@@ -292,26 +388,17 @@ class PDFGenService:
         Returns:
             PDF bytes
         """
-        buffer = io.BytesIO()
-
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=self.page_size,
-            rightMargin=self.margin,
-            leftMargin=self.margin,
-            topMargin=self.margin,
-            bottomMargin=self.margin,
-        )
+        return await asyncio.to_thread(self._build_simple_pdf_sync, title, content)
 
+    def _build_simple_pdf_sync(self, title: str, content: str) -> bytes:
+        """Build simple PDF synchronously (runs in a worker thread)"""
         story = [
             Paragraph(title, self.styles['CustomTitle']),
             Spacer(1, 0.5 * inch),
             Paragraph(content, self.styles['BodyText']),
         ]
 
-        doc.build(story)
-
-        pdf_bytes = buffer.getvalue()
-        buffer.close()
-
-        return pdf_bytes
+        with io.BytesIO() as buffer:
+            doc = self._create_doc_template(buffer)
+            doc.build(story)
+            return buffer.getvalue()
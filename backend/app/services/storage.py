@@ -17,22 +17,156 @@ AWS Deployment Notes:
     - S3 bucket created by deploy_aws.sh script
     - Uses IAM role for ECS tasks (no hardcoded credentials)
     - Presigned URLs expire based on S3_PRESIGNED_URL_EXPIRY setting
+    - Bucket default encryption (SSE-S3) is set by deploy_aws.sh; enable
+      S3_FORCE_SSE_HEADER only for buckets without it
     - Enable versioning on S3 bucket for production
     - Consider S3 lifecycle policies to archive old documents
 """
 
 import os
+import io
+import gzip
+import shutil
+import time
+import asyncio
 import logging
-from typing import Optional
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
-import aiofiles
-import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError
 
 from app.config import settings
+from app.services.aws import get_client, run_aws
 
 logger = logging.getLogger(__name__)
 
+# Managed S3 transfers: objects above the threshold are split into parts
+# that are uploaded in parallel threads
+_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=_MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=_MULTIPART_CHUNK_SIZE,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+# Presigned URLs kept per (key, expiry, time bucket); oldest evicted first
+_PRESIGNED_URL_CACHE_MAX_ENTRIES = 4096
+
+# Textract JSON is highly repetitive (~10x smaller gzipped); stored with
+# Content-Encoding: gzip so presigned downloads are decoded by the client
+_TEXTRACT_GZIP_LEVEL = 6
+_GZIP_MAGIC = b'\x1f\x8b'
+
+# S3 DeleteObjects accepts at most this many keys per request
+_DELETE_BATCH_SIZE = 1000
+
+# Objects larger than one chunk are downloaded as at most this many
+# concurrent ranged GETs (after the first chunk)
+_MAX_RANGE_REQUESTS = 8
+
+# File content as read back: bytes, or for S3 objects larger than one chunk
+# the bytearray they were downloaded into (returned without a final copy).
+# Treat it as read-only bytes-like; convert with bytes() before hashing or
+# using it as a dict key.
+FileContent = Union[bytes, bytearray]
+
+
+@contextmanager
+def _atomic_output(path: str) -> Iterator[int]:
+    """
+    Yield a file descriptor for a temp file next to path; on success the
+    temp file atomically replaces path (os.replace), so readers never see
+    a partially written file. On error the temp file is removed.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        os.fchmod(fd, 0o644)  # mkstemp creates files as 0600
+        yield fd
+    except BaseException:
+        os.close(fd)
+        os.unlink(tmp_path)
+        raise
+
+    os.close(fd)
+    os.replace(tmp_path, path)
+
+
+def _sync_write(path: str, content: bytes) -> None:
+    """Write file in one blocking call (run via asyncio.to_thread)"""
+    with _atomic_output(path) as fd, open(fd, 'wb', closefd=False) as f:
+        f.write(content)
+
+
+def _source_fd(fileobj: BinaryIO) -> Optional[int]:
+    """OS file descriptor backing fileobj, or None for in-memory files"""
+    # fileno() on a SpooledTemporaryFile still held in memory would force it
+    # to disk; its public name is None until it has rolled over to a file
+    if isinstance(fileobj, tempfile.SpooledTemporaryFile) and fileobj.name is None:
+        return None
+    try:
+        return fileobj.fileno()
+    except (AttributeError, io.UnsupportedOperation, OSError):
+        # e.g. BytesIO raises io.UnsupportedOperation
+        return None
+
+
+def _sync_copy_fileobj(path: str, src: BinaryIO) -> None:
+    """
+    Copy src (from its current position) to path in one blocking call
+    (run via asyncio.to_thread)
+
+    Disk-backed sources are copied in-kernel with os.sendfile; anything else
+    goes through shutil.copyfileobj.
+    """
+    src_fd = _source_fd(src)
+
+    with _atomic_output(path) as dst_fd:
+        if src_fd is not None and hasattr(os, 'sendfile'):
+            # sendfile with an explicit offset leaves src's own position untouched
+            src.flush()
+            offset = src.tell()
+            try:
+                while True:
+                    sent = os.sendfile(dst_fd, src_fd, offset, 1 << 20)
+                    if sent == 0:
+                        return
+                    offset += sent
+            except OSError:
+                # Platforms where sendfile only targets sockets: redo in userspace
+                os.ftruncate(dst_fd, 0)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+
+        with open(dst_fd, 'wb', closefd=False) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+
+
+def _sync_remove_many(paths: List[str]) -> List[bool]:
+    """Remove files in one blocking call (run via asyncio.to_thread)"""
+    results = []
+    for path in paths:
+        try:
+            os.remove(path)
+            results.append(True)
+        except FileNotFoundError:
+            results.append(False)
+        except OSError as e:
+            logger.error(f"Failed to delete local file {path}: {e}")
+            results.append(False)
+    return results
+
+
+def _sync_read(path: str) -> bytes:
+    """Read file in one blocking call (run via asyncio.to_thread)"""
+    with open(path, 'rb') as f:
+        return f.read()
+
 
 class StorageService:
     """
@@ -51,12 +185,13 @@ class StorageService:
         else:
             # S3 setup
             self.bucket_name = settings.S3_BUCKET_NAME
-            self.s3_client = boto3.client(
-                's3',
-                region_name=settings.AWS_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            )
+            self.s3_client = get_client('s3')
+
+            # Key prefixes resolved once rather than per call
+            self._images_prefix = settings.S3_PREFIX_IMAGES
+            self._pdfs_prefix = settings.S3_PREFIX_PDFS
+            self._textract_prefix = settings.S3_PREFIX_TEXTRACT
+            self._presigned_urls: Dict[Tuple[str, int, int], str] = {}
             logger.info(f"Storage: Using S3 bucket {self.bucket_name}")
 
     def _ensure_local_directories(self):
@@ -95,12 +230,41 @@ class StorageService:
             return await self._save_local(key, content, "images")
         else:
             return await self._save_s3(
-                key=f"{settings.S3_PREFIX_IMAGES}{key}",
+                key=self._images_prefix + key,
                 content=content,
                 content_type=content_type
             )
 
-    async def get_image(self, key: str) -> bytes:
+    async def save_image_fileobj(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: str = "image/jpeg"
+    ) -> str:
+        """
+        Save image to storage straight from a file-like object
+
+        Streams from the current position without reading the whole file
+        into memory (e.g. FastAPI UploadFile.file).
+
+        Args:
+            key: Storage key (path) for the image
+            fileobj: Binary file-like object with the image content
+            content_type: MIME type
+
+        Returns:
+            URL or path to the saved image
+        """
+        if self.use_local:
+            return await self._save_local_from_fileobj(key, fileobj, "images")
+        else:
+            return await self._save_s3_fileobj(
+                key=self._images_prefix + key,
+                fileobj=fileobj,
+                content_type=content_type
+            )
+
+    async def get_image(self, key: str) -> FileContent:
         """
         Retrieve image from storage
 
@@ -113,7 +277,7 @@ class StorageService:
         if self.use_local:
             return await self._get_local(key, "images")
         else:
-            return await self._get_s3(f"{settings.S3_PREFIX_IMAGES}{key}")
+            return await self._get_s3(self._images_prefix + key)
 
     # =========================================================================
     # PDF STORAGE
@@ -138,12 +302,12 @@ class StorageService:
             return await self._save_local(key, content, "pdfs")
         else:
             return await self._save_s3(
-                key=f"{settings.S3_PREFIX_PDFS}{key}",
+                key=self._pdfs_prefix + key,
                 content=content,
                 content_type="application/pdf"
             )
 
-    async def get_pdf(self, key: str) -> bytes:
+    async def get_pdf(self, key: str) -> FileContent:
         """
         Retrieve PDF from storage
 
@@ -156,7 +320,41 @@ class StorageService:
         if self.use_local:
             return await self._get_local(key, "pdfs")
         else:
-            return await self._get_s3(f"{settings.S3_PREFIX_PDFS}{key}")
+            return await self._get_s3(self._pdfs_prefix + key)
+
+    async def pdf_exists(self, key: str) -> bool:
+        """
+        Check whether a PDF saved with save_pdf exists
+
+        Args:
+            key: Storage key passed to save_pdf (without prefix)
+
+        Returns:
+            True if the PDF exists
+        """
+        return await self.file_exists(self._pdf_storage_key(key))
+
+    async def get_pdf_url(self, key: str, expiry: Optional[int] = None) -> str:
+        """
+        Get a download URL for a PDF saved with save_pdf
+
+        On S3 this is a presigned GET URL, so clients download straight
+        from S3 instead of through the API.
+
+        Args:
+            key: Storage key passed to save_pdf (without prefix)
+            expiry: URL expiry in seconds (default from settings)
+
+        Returns:
+            Presigned URL (S3) or local file path
+        """
+        return await self.get_presigned_url(self._pdf_storage_key(key), expiry)
+
+    def _pdf_storage_key(self, key: str) -> str:
+        """Full storage key (with prefix/subdirectory) for a PDF key"""
+        if self.use_local:
+            return os.path.join("pdfs", key)
+        return self._pdfs_prefix + key
 
     # =========================================================================
     # TEXTRACT JSON STORAGE
@@ -180,13 +378,17 @@ class StorageService:
         if self.use_local:
             return await self._save_local(key, content, "textract")
         else:
+            compressed = await asyncio.to_thread(
+                gzip.compress, content, _TEXTRACT_GZIP_LEVEL
+            )
             return await self._save_s3(
-                key=f"{settings.S3_PREFIX_TEXTRACT}{key}",
-                content=content,
-                content_type="application/json"
+                key=self._textract_prefix + key,
+                content=compressed,
+                content_type="application/json",
+                content_encoding="gzip"
             )
 
-    async def get_textract_json(self, key: str) -> bytes:
+    async def get_textract_json(self, key: str) -> FileContent:
         """
         Retrieve Textract JSON from storage
 
@@ -199,7 +401,11 @@ class StorageService:
         if self.use_local:
             return await self._get_local(key, "textract")
         else:
-            return await self._get_s3(f"{settings.S3_PREFIX_TEXTRACT}{key}")
+            content = await self._get_s3(self._textract_prefix + key)
+            # Objects saved before compression was added are plain JSON
+            if content[:2] == _GZIP_MAGIC:
+                content = await asyncio.to_thread(gzip.decompress, content)
+            return content
 
     # =========================================================================
     # PRESIGNED URLS
@@ -229,8 +435,18 @@ class StorageService:
             # Generate S3 presigned URL
             expiry = expiry or settings.S3_PRESIGNED_URL_EXPIRY
 
+            # Reuse the URL signed in the current quarter of the expiry window,
+            # so a cached URL always has at least 3/4 of its lifetime left.
+            # Concurrent misses may both sign; either URL is valid, so no lock.
+            bucket = int(time.time()) // max(1, expiry // 4)
+            cache_key = (key, expiry, bucket)
+            url = self._presigned_urls.get(cache_key)
+            if url is not None:
+                return url
+
             try:
-                url = self.s3_client.generate_presigned_url(
+                url = await run_aws(
+                    self.s3_client.generate_presigned_url,
                     'get_object',
                     Params={
                         'Bucket': self.bucket_name,
@@ -238,6 +454,12 @@ class StorageService:
                     },
                     ExpiresIn=expiry
                 )
+
+                self._presigned_urls[cache_key] = url
+                if len(self._presigned_urls) > _PRESIGNED_URL_CACHE_MAX_ENTRIES:
+                    # dicts keep insertion order: drop the oldest entry
+                    del self._presigned_urls[next(iter(self._presigned_urls))]
+
                 return url
 
             except ClientError as e:
@@ -261,10 +483,10 @@ class StorageService:
         if self.use_local:
             file_path = os.path.join(self.base_path, key)
             try:
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    logger.info(f"Deleted local file: {file_path}")
-                    return True
+                os.remove(file_path)
+                logger.info(f"Deleted local file: {file_path}")
+                return True
+            except FileNotFoundError:
                 return False
             except Exception as e:
                 logger.error(f"Failed to delete local file {file_path}: {e}")
@@ -272,7 +494,8 @@ class StorageService:
 
         else:
             try:
-                self.s3_client.delete_object(
+                await run_aws(
+                    self.s3_client.delete_object,
                     Bucket=self.bucket_name,
                     Key=key
                 )
@@ -283,6 +506,56 @@ class StorageService:
                 logger.error(f"Failed to delete S3 object {key}: {e}")
                 return False
 
+    async def delete_files(self, keys: List[str]) -> Dict[str, bool]:
+        """
+        Delete several files from storage with as few calls as possible
+
+        S3 deletes go out as DeleteObjects requests of up to 1000 keys;
+        local deletes run in a single worker-thread hop.
+
+        Args:
+            keys: Storage keys (full keys with prefix)
+
+        Returns:
+            Dict mapping each key to True if deleted successfully
+        """
+        if not keys:
+            return {}
+
+        if self.use_local:
+            paths = [os.path.join(self.base_path, key) for key in keys]
+            removed = await asyncio.to_thread(_sync_remove_many, paths)
+            logger.info(f"Deleted {sum(removed)}/{len(keys)} local files")
+            return dict(zip(keys, removed))
+
+        results = {}
+        for i in range(0, len(keys), _DELETE_BATCH_SIZE):
+            batch = keys[i:i + _DELETE_BATCH_SIZE]
+            try:
+                # Quiet mode: the response only lists the keys that failed
+                response = await run_aws(
+                    self.s3_client.delete_objects,
+                    Bucket=self.bucket_name,
+                    Delete={
+                        'Objects': [{'Key': key} for key in batch],
+                        'Quiet': True
+                    }
+                )
+                errors = response.get('Errors', [])
+                for error in errors:
+                    logger.error(f"Failed to delete S3 object {error['Key']}: {error.get('Message')}")
+                failed = {error['Key'] for error in errors}
+
+            except ClientError as e:
+                logger.error(f"Failed to delete S3 objects: {e}")
+                failed = set(batch)
+
+            for key in batch:
+                results[key] = key not in failed
+
+        logger.info(f"Deleted {sum(results.values())}/{len(keys)} S3 objects")
+        return results
+
     # =========================================================================
     # INTERNAL METHODS - LOCAL STORAGE
     # =========================================================================
@@ -304,14 +577,34 @@ class StorageService:
         Returns:
             Local file path
         """
-        # Create directory structure if needed
         file_path = os.path.join(self.base_path, subdirectory, key)
-        directory = os.path.dirname(file_path)
-        os.makedirs(directory, exist_ok=True)
 
-        # Write file asynchronously
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
+        # Create directories and write in a single worker-thread hop
+        await asyncio.to_thread(_sync_write, file_path, content)
+
+        logger.info(f"Saved file locally: {file_path}")
+        return file_path
+
+    async def _save_local_from_fileobj(
+        self,
+        key: str,
+        src_fileobj: BinaryIO,
+        subdirectory: str
+    ) -> str:
+        """
+        Save file to local file system from a file-like object
+
+        Args:
+            key: File key (relative path)
+            src_fileobj: Source file-like object
+            subdirectory: Subdirectory (images, pdfs, textract)
+
+        Returns:
+            Local file path
+        """
+        file_path = os.path.join(self.base_path, subdirectory, key)
+
+        await asyncio.to_thread(_sync_copy_fileobj, file_path, src_fileobj)
 
         logger.info(f"Saved file locally: {file_path}")
         return file_path
@@ -333,13 +626,8 @@ class StorageService:
         """
         file_path = os.path.join(self.base_path, subdirectory, key)
 
-        if not os.path.exists(file_path):
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        async with aiofiles.open(file_path, 'rb') as f:
-            content = await f.read()
-
-        return content
+        # open() raises FileNotFoundError itself; no separate exists() check
+        return await asyncio.to_thread(_sync_read, file_path)
 
     # =========================================================================
     # INTERNAL METHODS - S3 STORAGE
@@ -349,7 +637,8 @@ class StorageService:
         self,
         key: str,
         content: bytes,
-        content_type: str
+        content_type: str,
+        content_encoding: Optional[str] = None
     ) -> str:
         """
         Save file to S3
@@ -358,17 +647,43 @@ class StorageService:
             key: S3 key (full path with prefix)
             content: File content
             content_type: MIME type
+            content_encoding: Content-Encoding of the stored bytes (e.g. gzip)
+
+        Returns:
+            S3 URL
+        """
+        return await self._save_s3_fileobj(
+            key, io.BytesIO(content), content_type, content_encoding
+        )
+
+    async def _save_s3_fileobj(
+        self,
+        key: str,
+        fileobj: BinaryIO,
+        content_type: str,
+        content_encoding: Optional[str] = None
+    ) -> str:
+        """
+        Save file to S3 from a file-like object
+
+        Args:
+            key: S3 key (full path with prefix)
+            fileobj: Binary file-like object, read from its current position
+            content_type: MIME type
+            content_encoding: Content-Encoding of the stored bytes (e.g. gzip)
 
         Returns:
             S3 URL
         """
         try:
-            self.s3_client.put_object(
-                Bucket=self.bucket_name,
-                Key=key,
-                Body=content,
-                ContentType=content_type,
-                ServerSideEncryption='AES256',  # Enable encryption
+            # Single PUT below the multipart threshold, parallel parts above it
+            await run_aws(
+                self.s3_client.upload_fileobj,
+                fileobj,
+                self.bucket_name,
+                key,
+                ExtraArgs=self._put_extra_args(content_type, content_encoding),
+                Config=_TRANSFER_CONFIG,
             )
 
             # Return S3 URL
@@ -376,32 +691,137 @@ class StorageService:
             logger.info(f"Saved file to S3: {url}")
             return url
 
-        except ClientError as e:
+        except (ClientError, S3UploadFailedError) as e:
             logger.error(f"Failed to save to S3: {e}")
             raise
 
-    async def _get_s3(self, key: str) -> bytes:
+    @staticmethod
+    def _put_extra_args(
+        content_type: str,
+        content_encoding: Optional[str] = None
+    ) -> Dict[str, str]:
+        """
+        Extra args for S3 uploads
+
+        Objects inherit the bucket's default encryption unless
+        S3_FORCE_SSE_HEADER asks for SSE-S3 on every request.
+        """
+        extra_args = {'ContentType': content_type}
+        if content_encoding:
+            extra_args['ContentEncoding'] = content_encoding
+        if settings.S3_FORCE_SSE_HEADER:
+            extra_args['ServerSideEncryption'] = 'AES256'
+        return extra_args
+
+    async def _get_s3(self, key: str) -> FileContent:
         """
         Read file from S3
 
+        The first ranged GET doubles as a size probe, so objects up to one
+        chunk need a single request; the rest of a larger object is fetched
+        as concurrent ranged GETs pinned to the same ETag, written straight
+        into one preallocated bytearray. That buffer is returned as-is:
+        copying it to bytes would double peak memory for large objects.
+
         Args:
             key: S3 key (full path with prefix)
 
         Returns:
-            File content
+            File content (bytes, or a bytearray for multi-range objects)
         """
         try:
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=key
+            first, total, etag = await run_aws(
+                self._get_s3_range, key, 0, _MULTIPART_CHUNK_SIZE - 1
             )
-            content = response['Body'].read()
-            return content
+            if total <= len(first):
+                return first
+
+            # One buffer for the whole object; each range streams into its own
+            # slice, so no per-part bytes objects or join
+            buffer = bytearray(total)
+            view = memoryview(buffer)
+            view[:len(first)] = first
+
+            remaining = total - len(first)
+            part_size = max(_MULTIPART_CHUNK_SIZE, -(-remaining // _MAX_RANGE_REQUESTS))
+
+            await asyncio.gather(*(
+                run_aws(
+                    self._read_s3_range_into, key, start, etag,
+                    view[start:min(start + part_size, total)]
+                )
+                for start in range(len(first), total, part_size)
+            ))
+
+            # Drop the export so callers get an ordinary, resizable bytearray
+            view.release()
+            return buffer
 
         except ClientError as e:
+            # Ranged GET on an empty object
+            if e.response['Error']['Code'] == 'InvalidRange':
+                return b''
+
             logger.error(f"Failed to read from S3: {e}")
             raise
 
+    def _get_s3_range(
+        self,
+        key: str,
+        start: int,
+        end: int,
+        etag: Optional[str] = None
+    ) -> Tuple[bytes, int, str]:
+        """
+        Read an inclusive byte range of an S3 object (blocking)
+
+        Returns:
+            Tuple of (content, total_object_size, etag)
+        """
+        params = {
+            'Bucket': self.bucket_name,
+            'Key': key,
+            'Range': f"bytes={start}-{end}",
+        }
+        if etag:
+            params['IfMatch'] = etag
+
+        response = self.s3_client.get_object(**params)
+        total = int(response['ContentRange'].rsplit('/', 1)[1])
+
+        return response['Body'].read(), total, response['ETag']
+
+    def _read_s3_range_into(
+        self,
+        key: str,
+        start: int,
+        etag: str,
+        target: memoryview
+    ) -> None:
+        """
+        Fill target with the object bytes starting at start (blocking)
+
+        Args:
+            key: S3 key (full path with prefix)
+            start: Offset of target[0] within the object
+            etag: ETag the object must still match
+            target: Slice of the destination buffer
+        """
+        response = self.s3_client.get_object(
+            Bucket=self.bucket_name,
+            Key=key,
+            Range=f"bytes={start}-{start + len(target) - 1}",
+            IfMatch=etag,
+        )
+
+        pos = 0
+        for chunk in response['Body'].iter_chunks(chunk_size=1 << 20):
+            target[pos:pos + len(chunk)] = chunk
+            pos += len(chunk)
+
+        if pos != len(target):
+            raise IOError(f"Short read for {key} at offset {start}: {pos}/{len(target)} bytes")
+
     # =========================================================================
     # UTILITY METHODS
     # =========================================================================
@@ -418,11 +838,16 @@ class StorageService:
         """
         if self.use_local:
             file_path = os.path.join(self.base_path, key)
-            return os.path.exists(file_path)
+            try:
+                os.stat(file_path)
+                return True
+            except FileNotFoundError:
+                return False
 
         else:
             try:
-                self.s3_client.head_object(
+                await run_aws(
+                    self.s3_client.head_object,
                     Bucket=self.bucket_name,
                     Key=key
                 )
@@ -443,13 +868,15 @@ class StorageService:
         """
         if self.use_local:
             file_path = os.path.join(self.base_path, key)
-            if os.path.exists(file_path):
-                return os.path.getsize(file_path)
-            return None
+            try:
+                return os.stat(file_path).st_size
+            except FileNotFoundError:
+                return None
 
         else:
             try:
-                response = self.s3_client.head_object(
+                response = await run_aws(
+                    self.s3_client.head_object,
                     Bucket=self.bucket_name,
                     Key=key
                 )
@@ -20,20 +20,150 @@ AWS Deployment Notes:
     - IAM role needs textract:DetectDocumentText and textract:AnalyzeDocument permissions
 """
 
+import os
 import logging
+import asyncio
 import json
-from typing import Dict, List, Optional, Tuple
-import boto3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 from botocore.exceptions import ClientError
 import pytesseract
 from PIL import Image
 import io
+import statistics
+from operator import itemgetter
 
 from app.config import settings
+from app.services.aws import get_client, run_aws
 
 logger = logging.getLogger(__name__)
 
 
+# Cap on in-flight Textract calls per event loop: per-document limits alone
+# multiply with the number of documents being processed at once
+_TEXTRACT_INFLIGHT = threading.local()
+
+
+def _textract_inflight() -> asyncio.Semaphore:
+    """
+    Get the running loop's in-flight Textract semaphore, creating it on first use
+
+    asyncio primitives bind to the loop they are first contended on, so each
+    loop (the server's, or asyncio.run in a worker or test) needs its own.
+    A thread runs one loop at a time, so each thread keeps the semaphore for
+    its current loop and replaces it when a new loop starts (a mapping keyed
+    by loop would never shrink: the semaphore references its loop).
+    """
+    loop = asyncio.get_running_loop()
+    state = _TEXTRACT_INFLIGHT
+    if getattr(state, 'loop', None) is not loop:
+        state.loop = loop
+        state.semaphore = asyncio.Semaphore(settings.TEXTRACT_MAX_INFLIGHT)
+    return state.semaphore
+
+
+# Tesseract OCR runs in worker processes (CPU-bound PIL work + TSV parsing
+# would otherwise contend for the GIL); created on first use
+_OCR_POOL: Optional[ProcessPoolExecutor] = None
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    """Get the process pool for Tesseract, creating it on first use"""
+    global _OCR_POOL
+    if _OCR_POOL is None:
+        _OCR_POOL = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    return _OCR_POOL
+
+
+def _run_tesseract(
+    image_content: Union[bytes, bytearray],
+    lang: str,
+    config: str,
+    max_dim: int = 0,
+    tesseract_cmd: Optional[str] = None
+) -> Tuple[str, float]:
+    """
+    OCR an image with a single Tesseract run (blocking; runs in _OCR_POOL)
+
+    image_to_data already returns every word with its confidence and
+    block/paragraph/line numbers, so the text is rebuilt from it rather
+    than running OCR a second time through image_to_string.
+
+    OCR cost grows with pixel count while accuracy plateaus around 300 DPI,
+    so images larger than max_dim are converted to grayscale and shrunk
+    first. Tesseract always reads its input from a file: images that need
+    no resizing are passed through as the original bytes (PIL only reads
+    the header), resized ones as an uncompressed PGM -- either way nothing
+    is decoded twice or re-encoded to PNG the way pytesseract does for
+    PIL images.
+
+    Returns:
+        Tuple of (text, average_confidence)
+    """
+    if tesseract_cmd:
+        # Worker processes don't necessarily inherit the parent's setting
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    # Lazy: reads the header only, pixels are decoded on first access
+    image = Image.open(io.BytesIO(image_content))
+    downscale = max_dim > 0 and max(image.size) > max_dim
+
+    with tempfile.NamedTemporaryFile(suffix='.pgm' if downscale else '.img') as tmp:
+        if downscale:
+            # JPEGs are scaled down inside the decoder (no-op for other formats)
+            image.draft('L', (max_dim, max_dim))
+            image = image.convert('L')
+            image.thumbnail((max_dim, max_dim), Image.Resampling.BILINEAR)
+            image.save(tmp, format='PPM')
+        else:
+            tmp.write(image_content)
+        tmp.flush()
+
+        data = pytesseract.image_to_data(
+            tmp.name,
+            lang=lang,
+            config=config,
+            output_type=pytesseract.Output.DICT
+        )
+
+    parts = []
+    confidences = []
+    prev_line = prev_par = None
+
+    for i, word in enumerate(data['text']):
+        word = (word or '').strip()
+        if not word:
+            continue
+
+        par = (data['page_num'][i], data['block_num'][i], data['par_num'][i])
+        line = (*par, data['line_num'][i])
+
+        # Words on a line joined by spaces, lines by newlines,
+        # paragraphs by a blank line (same layout as image_to_string)
+        if prev_line is None:
+            pass
+        elif line == prev_line:
+            parts.append(' ')
+        else:
+            parts.append('\n' if par == prev_par else '\n\n')
+        parts.append(word)
+        prev_line, prev_par = line, par
+
+        # -1 means no confidence for this entry
+        try:
+            conf = float(data['conf'][i])
+        except (TypeError, ValueError):
+            continue
+        if conf >= 0:
+            confidences.append(conf)
+
+    avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+
+    return ''.join(parts), avg_confidence
+
+
 class TextractService:
     """
     OCR service supporting both Textract (AWS) and Tesseract (local)
@@ -43,12 +173,7 @@ class TextractService:
         self.provider = settings.OCR_PROVIDER
 
         if self.provider == "textract":
-            self.textract_client = boto3.client(
-                'textract',
-                region_name=settings.AWS_REGION,
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            )
+            self.textract_client = get_client('textract')
             logger.info("OCR: Using AWS Textract")
 
         else:
@@ -62,7 +187,7 @@ class TextractService:
 
     async def extract_text_from_image(
         self,
-        image_content: bytes,
+        image_content: Union[bytes, bytearray],
         s3_bucket: Optional[str] = None,
         s3_key: Optional[str] = None
     ) -> Tuple[str, float, Optional[Dict]]:
@@ -92,6 +217,46 @@ class TextractService:
         Args:
             images: List of (image_content, s3_bucket, s3_key) tuples
 
+        Returns:
+            Tuple of (combined_text, avg_confidence, list_of_raw_jsons)
+        """
+        # Pages are independent, so OCR them concurrently
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def extract_page(idx, image_content, s3_bucket, s3_key):
+            async with semaphore:
+                logger.debug("Processing image %d/%d", idx, len(images))
+                return await self.extract_text_from_image(
+                    image_content, s3_bucket, s3_key
+                )
+
+        results = await asyncio.gather(*(
+            extract_page(idx, image_content, s3_bucket, s3_key)
+            for idx, (image_content, s3_bucket, s3_key) in enumerate(images, 1)
+        ))
+
+        return self.combine_pages(results)
+
+    @property
+    def max_concurrency(self) -> int:
+        """
+        Pages to OCR at once: under the Textract TPS quota, or one per core
+        for Tesseract
+        """
+        if self.provider == "textract":
+            return settings.TEXTRACT_MAX_CONCURRENCY
+        return os.cpu_count() or 1
+
+    @staticmethod
+    def combine_pages(
+        results: List[Tuple[str, float, Optional[Dict]]]
+    ) -> Tuple[str, float, List[Dict]]:
+        """
+        Combine per-page OCR results (in page order) into one document
+
+        Args:
+            results: List of (text, confidence, raw_json) per page
+
         Returns:
             Tuple of (combined_text, avg_confidence, list_of_raw_jsons)
         """
@@ -99,13 +264,7 @@ class TextractService:
         all_confidence = []
         all_json = []
 
-        for idx, (image_content, s3_bucket, s3_key) in enumerate(images, 1):
-            logger.info(f"Processing image {idx}/{len(images)}")
-
-            text, confidence, raw_json = await self.extract_text_from_image(
-                image_content, s3_bucket, s3_key
-            )
-
+        for idx, (text, confidence, raw_json) in enumerate(results, 1):
             all_text.append(f"--- Page {idx} ---\n{text}")
             all_confidence.append(confidence)
             if raw_json:
@@ -124,7 +283,7 @@ class TextractService:
         self,
         s3_bucket: Optional[str],
         s3_key: Optional[str],
-        image_content: Optional[bytes] = None
+        image_content: Optional[Union[bytes, bytearray]] = None
     ) -> Tuple[str, float, Dict]:
         """
         Extract text using AWS Textract
@@ -137,32 +296,35 @@ class TextractService:
         Returns:
             Tuple of (text, confidence, raw_response)
         """
+        # Textract can accept either S3 reference or direct bytes
+        if s3_bucket and s3_key:
+            # Use S3 reference (recommended for production)
+            document = {
+                'S3Object': {
+                    'Bucket': s3_bucket,
+                    'Name': s3_key
+                }
+            }
+        elif image_content:
+            # Use direct bytes (for small images, < 5MB)
+            document = {'Bytes': image_content}
+        else:
+            raise ValueError("Either S3 reference or image_content must be provided")
+
         try:
-            # Textract can accept either S3 reference or direct bytes
-            if s3_bucket and s3_key:
-                # Use S3 reference (recommended for production)
-                response = self.textract_client.detect_document_text(
-                    Document={
-                        'S3Object': {
-                            'Bucket': s3_bucket,
-                            'Name': s3_key
-                        }
-                    }
+            # Throttling (ThrottlingException, ProvisionedThroughputExceeded)
+            # is retried by the client's adaptive mode with exponential
+            # backoff and a shared client-side rate limiter
+            async with _textract_inflight():
+                response = await run_aws(
+                    self.textract_client.detect_document_text,
+                    Document=document
                 )
-            elif image_content:
-                # Use direct bytes (for small images, < 5MB)
-                response = self.textract_client.detect_document_text(
-                    Document={
-                        'Bytes': image_content
-                    }
-                )
-            else:
-                raise ValueError("Either S3 reference or image_content must be provided")
 
             # Parse Textract response
             text, confidence = self._parse_textract_response(response)
 
-            logger.info(f"Textract extracted {len(text)} characters with {confidence:.2f}% confidence")
+            logger.debug("Textract extracted %d characters with %.2f%% confidence", len(text), confidence)
 
             return text, confidence, response
 
@@ -176,8 +338,11 @@ class TextractService:
 
         Algorithm:
         1. Extract all LINE blocks (Textract organizes text into blocks)
-        2. Sort by geometry (top-to-bottom, left-to-right)
-        3. Join lines with newlines to preserve document structure
+        2. Group lines into rows: walking top-to-bottom, a line starts a new
+           row once its Top is more than half the median line height below
+           the row's first line (absorbs OCR jitter in Top on one row)
+        3. Sort rows top-to-bottom, lines within a row left-to-right
+        4. Join lines with newlines to preserve document structure
 
         Args:
             response: Textract API response
@@ -185,42 +350,47 @@ class TextractService:
         Returns:
             Tuple of (extracted_text, average_confidence)
         """
-        blocks = response.get('Blocks', [])
-
-        # Extract LINE blocks with geometry
+        # One pass, one (top, left, text) tuple per line -- no per-line dict,
+        # no side lists; confidence is summed on the fly
         lines = []
-        confidences = []
-
-        for block in blocks:
-            if block['BlockType'] == 'LINE':
-                text = block.get('Text', '')
-                confidence = block.get('Confidence', 0.0)
-
-                # Get geometry for sorting
-                geometry = block.get('Geometry', {})
-                bounding_box = geometry.get('BoundingBox', {})
-
-                top = bounding_box.get('Top', 0.0)
-                left = bounding_box.get('Left', 0.0)
-
-                lines.append({
-                    'text': text,
-                    'confidence': confidence,
-                    'top': top,
-                    'left': left
-                })
-
-                confidences.append(confidence)
-
-        # Sort by reading order: top-to-bottom, then left-to-right
-        # Group lines by vertical position (tolerance for same row)
-        sorted_lines = sorted(lines, key=lambda x: (round(x['top'] * 100), x['left']))
+        heights = []
+        confidence_sum = 0.0
+
+        for block in response.get('Blocks', []):
+            if block['BlockType'] != 'LINE':
+                continue
+
+            bounding_box = block.get('Geometry', {}).get('BoundingBox', {})
+
+            lines.append((
+                bounding_box.get('Top', 0.0),
+                bounding_box.get('Left', 0.0),
+                block.get('Text', ''),
+            ))
+            heights.append(bounding_box.get('Height', 0.0))
+            confidence_sum += block.get('Confidence', 0.0)
+
+        # Row band: half a typical line; 0.5% of the page if heights are missing
+        band = max(statistics.median(heights) * 0.5, 0.005) if heights else 0.0
+
+        # Reading order: assign row numbers in Top order, then sort by
+        # (row, left) (itemgetter is a C-level key; the stable sort keeps ties)
+        lines.sort(key=itemgetter(0))
+        rows = []
+        row = -1
+        row_top = None
+        for top, left, text in lines:
+            if row_top is None or top - row_top > band:
+                row += 1
+                row_top = top
+            rows.append((row, left, text))
+        rows.sort(key=itemgetter(0, 1))
 
         # Extract text
-        extracted_text = '\n'.join(line['text'] for line in sorted_lines)
+        extracted_text = '\n'.join([text for _, _, text in rows])
 
         # Calculate average confidence
-        avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        avg_confidence = confidence_sum / len(lines) if lines else 0.0
 
         return extracted_text, avg_confidence
 
@@ -230,7 +400,7 @@ class TextractService:
 
     async def _extract_tesseract(
         self,
-        image_content: bytes
+        image_content: Union[bytes, bytearray]
     ) -> Tuple[str, float, None]:
         """
         Extract text using Tesseract OCR
@@ -242,35 +412,21 @@ class TextractService:
             Tuple of (text, confidence, None)
         """
         try:
-            # Open image with PIL
-            image = Image.open(io.BytesIO(image_content))
-
-            # Run Tesseract
-            custom_config = settings.TESSERACT_CONFIG
-            text = pytesseract.image_to_string(
-                image,
-                lang=settings.TESSERACT_LANG,
-                config=custom_config
-            )
-
-            # Get confidence data
-            data = pytesseract.image_to_data(
-                image,
-                lang=settings.TESSERACT_LANG,
-                output_type=pytesseract.Output.DICT
+            # One Tesseract run, in a worker process
+            loop = asyncio.get_running_loop()
+            text, avg_confidence = await loop.run_in_executor(
+                _get_ocr_pool(),
+                _run_tesseract,
+                image_content,
+                settings.TESSERACT_LANG,
+                settings.TESSERACT_CONFIG,
+                settings.TESSERACT_MAX_DIM,
+                settings.TESSERACT_PATH
             )
 
-            # Calculate average confidence (excluding -1 values which mean no text)
-            confidences = [
-                float(conf) for conf in data['conf']
-                if conf != -1 and str(conf).replace('.','').replace('-','').isdigit()
-            ]
-
-            avg_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-
-            logger.info(f"Tesseract extracted {len(text)} characters with {avg_confidence:.2f}% confidence")
+            logger.debug("Tesseract extracted %d characters with %.2f%% confidence", len(text), avg_confidence)
 
-            return text.strip(), avg_confidence, None
+            return text, avg_confidence, None
 
         except Exception as e:
             logger.error(f"Tesseract error: {e}")
@@ -299,7 +455,8 @@ class TextractService:
             raise NotImplementedError("Async jobs only available with Textract")
 
         try:
-            response = self.textract_client.start_document_text_detection(
+            response = await run_aws(
+                self.textract_client.start_document_text_detection,
                 DocumentLocation={
                     'S3Object': {
                         'Bucket': s3_bucket,
@@ -336,7 +493,8 @@ class TextractService:
             raise NotImplementedError("Async jobs only available with Textract")
 
         try:
-            response = self.textract_client.get_document_text_detection(
+            response = await run_aws(
+                self.textract_client.get_document_text_detection,
                 JobId=job_id
             )
 
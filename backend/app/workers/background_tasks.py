@@ -13,10 +13,14 @@ AWS Deployment Notes:
     - See lambda/ directory for Lambda handler implementations
 """
 
+import asyncio
 import logging
+import time
+from contextvars import ContextVar
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import Optional
-import json
+from typing import Dict, Optional
+import orjson
 
 from app.config import settings
 from app.services.db import DatabaseService
@@ -30,84 +34,160 @@ from app.models.reminder import ReminderStatus
 
 logger = logging.getLogger(__name__)
 
-# Initialize services
-db_service = DatabaseService()
-storage_service = StorageService()
-textract_service = TextractService()
-llm_service = LLMService()
-pdf_service = PDFGenService()
+
+# =============================================================================
+# SERVICES
+# =============================================================================
+# Created on first use so a worker only pays for the clients its task
+# touches (a cold start that never runs OCR never builds the OCR service)
+
+@lru_cache(maxsize=1)
+def get_db_service() -> DatabaseService:
+    """Get the shared database service instance"""
+    return DatabaseService()
+
+
+@lru_cache(maxsize=1)
+def get_storage_service() -> StorageService:
+    """Get the shared storage service instance"""
+    return StorageService()
+
+
+@lru_cache(maxsize=1)
+def get_textract_service() -> TextractService:
+    """Get the shared Textract/OCR service instance"""
+    return TextractService()
+
+
+@lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    """Get the shared LLM service instance"""
+    return LLMService()
+
+
+@lru_cache(maxsize=1)
+def get_pdf_service() -> PDFGenService:
+    """Get the shared PDF generation service instance"""
+    return PDFGenService()
+
 
 # Global scheduler instance
 scheduler = None
 
+# Document lookups shared within one task run (see get_document_cached);
+# unset outside such a run, so lookups go straight to the database
+_document_cache: ContextVar[Optional[Dict[str, "asyncio.Future"]]] = ContextVar(
+    "document_cache", default=None
+)
+
+
+async def get_document_cached(document_id: str) -> Optional[Document]:
+    """
+    Get a document, reusing lookups made earlier in the same task run
+
+    A task opts in with _document_cache.set({}); coroutines it gathers
+    inherit the context, so concurrent lookups of one document share a
+    single DynamoDB read.
+    """
+    cache = _document_cache.get()
+    if cache is None:
+        return await get_db_service().get_document(document_id)
+
+    lookup = cache.get(document_id)
+    if lookup is None:
+        lookup = cache[document_id] = asyncio.ensure_future(
+            get_db_service().get_document(document_id)
+        )
+    return await lookup
+
 
 # =============================================================================
 # OCR PROCESSING TASK
 # =============================================================================
 
-async def process_ocr_task(document_id: str):
+async def process_ocr_task(document_id: str, document: Optional[Document] = None):
     """
     Background task to process OCR for a document
 
     Args:
         document_id: Document ID to process
+        document: The document, if the caller already loaded it (saves a
+            DynamoDB read; SQS/Lambda workers pass only the ID)
     """
     logger.info(f"Starting OCR processing for document: {document_id}")
 
     try:
         # Get document
-        document = await db_service.get_document(document_id)
+        if document is None:
+            document = await get_db_service().get_document(document_id)
 
         if not document:
             logger.error(f"Document not found: {document_id}")
             return
 
-        # Get images from storage
-        images = []
+        storage_service = get_storage_service()
+        textract_service = get_textract_service()
+        image_keys = document.image_keys
+
+        # Textract reads S3 objects directly, so image bytes are only needed
+        # for local storage or local OCR
+        needs_bytes = settings.USE_LOCAL_STORAGE or settings.OCR_PROVIDER != "textract"
 
-        for image_key in document.image_keys:
-            logger.info(f"Fetching image: {image_key}")
+        if settings.USE_LOCAL_STORAGE:
+            s3_refs = [(None, None)] * len(image_keys)
+        else:
+            # For Textract, pass S3 reference
+            s3_refs = [
+                (settings.S3_BUCKET_NAME, f"{settings.S3_PREFIX_IMAGES}{image_key}")
+                for image_key in image_keys
+            ]
 
-            # Determine if using S3 or local storage
-            if settings.USE_LOCAL_STORAGE:
-                image_content = await storage_service.get_image(image_key)
-                images.append((image_content, None, None))
-            else:
-                # For Textract, pass S3 reference
-                bucket = settings.S3_BUCKET_NAME
-                key = f"{settings.S3_PREFIX_IMAGES}{image_key}"
-                images.append((None, bucket, key))
+        fetch_semaphore = asyncio.Semaphore(settings.S3_MAX_CONCURRENCY)
+
+        async def fetch_image(image_key):
+            async with fetch_semaphore:
+                logger.debug("Fetching image: %s", image_key)
+                return await storage_service.get_image(image_key)
 
         # Extract text from all images
-        if len(images) == 1:
-            # Single image
-            image_content, s3_bucket, s3_key = images[0]
-            if image_content:
-                # Use image bytes
-                ocr_text, confidence, raw_json = await textract_service.extract_text_from_image(
-                    image_content=image_content
-                )
-            else:
-                # Use S3 reference
-                ocr_text, confidence, raw_json = await textract_service.extract_text_from_image(
-                    image_content=None,
-                    s3_bucket=s3_bucket,
-                    s3_key=s3_key
-                )
+        if len(image_keys) == 1:
+            # Single image (Textract uses the S3 reference when there is one)
+            image_content = await fetch_image(image_keys[0]) if needs_bytes else None
+            s3_bucket, s3_key = s3_refs[0]
+            ocr_text, confidence, raw_json = await textract_service.extract_text_from_image(
+                image_content=image_content,
+                s3_bucket=s3_bucket,
+                s3_key=s3_key
+            )
 
             raw_jsons = [raw_json] if raw_json else []
 
-        else:
-            # Multiple images - need to load content for multi-image processing
-            loaded_images = []
-            for image_content, s3_bucket, s3_key in images:
-                if not image_content and s3_bucket and s3_key:
-                    # Load from S3
-                    image_content = await storage_service._get_s3(s3_key)
-                loaded_images.append((image_content, s3_bucket, s3_key))
+        elif needs_bytes:
+            # Rolling prefetch: each page is fetched then OCR'd, and the window
+            # lets the next pages download while earlier ones are in OCR
+            # (bounded, so a large document is never held in memory at once)
+            ocr_slots = textract_service.max_concurrency
+            ocr_semaphore = asyncio.Semaphore(ocr_slots)
+            window = asyncio.Semaphore(2 * ocr_slots)
+
+            async def ocr_page(idx, image_key, s3_bucket, s3_key):
+                async with window:
+                    image_content = await fetch_image(image_key)
+                    async with ocr_semaphore:
+                        logger.debug("Processing image %d/%d", idx, len(image_keys))
+                        return await textract_service.extract_text_from_image(
+                            image_content, s3_bucket, s3_key
+                        )
+
+            results = await asyncio.gather(*(
+                ocr_page(idx, image_key, s3_bucket, s3_key)
+                for idx, (image_key, (s3_bucket, s3_key)) in enumerate(zip(image_keys, s3_refs), 1)
+            ))
+            ocr_text, confidence, raw_jsons = textract_service.combine_pages(results)
 
+        else:
             ocr_text, confidence, raw_jsons = await textract_service.extract_text_from_multiple_images(
-                loaded_images
+                [(None, s3_bucket, s3_key) for s3_bucket, s3_key in s3_refs]
             )
 
         logger.info(f"OCR completed: {len(ocr_text)} characters, {confidence:.1f}% confidence")
@@ -116,20 +196,26 @@ async def process_ocr_task(document_id: str):
         textract_json_key = None
         if raw_jsons and settings.OCR_PROVIDER == "textract":
             textract_json_key = f"{document_id}/textract.json"
-            json_bytes = json.dumps(raw_jsons).encode('utf-8')
-            await storage_service.save_textract_json(textract_json_key, json_bytes)
+            # Multi-page Textract output runs to megabytes; serialize off the loop
+            json_bytes = await asyncio.to_thread(
+                orjson.dumps, raw_jsons, option=orjson.OPT_NON_STR_KEYS
+            )
+            await get_storage_service().save_textract_json(textract_json_key, json_bytes)
             logger.info(f"Saved Textract JSON: {textract_json_key}")
 
         # Update document
-        document.ocr_text = ocr_text
-        document.ocr_confidence = confidence
-        document.textract_json_key = textract_json_key
-        document.page_count = len(images)
-        document.ocr_status = ProcessingStatus.COMPLETED
-        document.status = DocumentStatus.COMPLETED
-        document.processed_at = datetime.utcnow()
-
-        await db_service.update_document(document)
+        fields = {
+            'ocr_text': ocr_text,
+            'ocr_confidence': confidence,
+            'page_count': len(image_keys),
+            'ocr_status': ProcessingStatus.COMPLETED,
+            'status': DocumentStatus.COMPLETED,
+            'processed_at': datetime.utcnow(),
+        }
+        if textract_json_key:
+            fields['textract_json_key'] = textract_json_key
+
+        await get_db_service().update_document_fields(document_id, **fields)
 
         logger.info(f"OCR processing completed for document: {document_id}")
 
@@ -137,48 +223,57 @@ async def process_ocr_task(document_id: str):
         logger.error(f"OCR processing failed for {document_id}: {e}", exc_info=True)
 
         # Update document status to failed
-        document = await db_service.get_document(document_id)
-        if document:
-            document.ocr_status = ProcessingStatus.FAILED
-            document.status = DocumentStatus.FAILED
-            document.error_message = str(e)
-            await db_service.update_document(document)
+        await get_db_service().update_document_fields(
+            document_id,
+            ocr_status=ProcessingStatus.FAILED,
+            status=DocumentStatus.FAILED,
+            error_message=str(e),
+        )
 
 
 # =============================================================================
 # ANALYSIS PROCESSING TASK
 # =============================================================================
 
-async def process_analysis_task(analysis_id: str):
+async def process_analysis_task(
+    analysis_id: str,
+    analysis: Optional[Analysis] = None,
+    document: Optional[Document] = None
+):
     """
     Background task to process document analysis
 
     Args:
         analysis_id: Analysis ID to process
+        analysis: The analysis record, if the caller already has it
+        document: The analysed document, if the caller already loaded it
+            (each saves a DynamoDB read; SQS/Lambda workers pass only the ID)
     """
     logger.info(f"Starting analysis processing for: {analysis_id}")
 
     try:
         # Get analysis
-        analysis = await db_service.get_analysis(analysis_id)
+        if analysis is None:
+            analysis = await get_db_service().get_analysis(analysis_id)
 
         if not analysis:
             logger.error(f"Analysis not found: {analysis_id}")
             return
 
         # Get document
-        document = await db_service.get_document(analysis.document_id)
+        if document is None:
+            document = await get_db_service().get_document(analysis.document_id)
 
         if not document or not document.ocr_text:
             logger.error(f"Document or OCR text not found for analysis: {analysis_id}")
             analysis.status = AnalysisStatus.FAILED
             analysis.error_message = "Document or OCR text not found"
-            await db_service.update_analysis(analysis)
+            await get_db_service().update_analysis(analysis)
             return
 
         # Perform analysis
         logger.info(f"Analyzing document: {analysis.document_id}")
-        result = await llm_service.analyze_document(document.ocr_text)
+        result = await get_llm_service().analyze_document(document.ocr_text)
 
         # Update analysis
         analysis.category = result.get('category', 'other')
@@ -186,15 +281,16 @@ async def process_analysis_task(analysis_id: str):
         analysis.summary = result.get('summary')
         analysis.key_entities = result.get('key_entities', {})
         analysis.suggested_tags = result.get('suggested_tags', [])
-        analysis.raw_llm_response = json.dumps(result)
+        analysis.raw_llm_response = orjson.dumps(result).decode()
         analysis.status = AnalysisStatus.COMPLETED
         analysis.completed_at = datetime.utcnow()
 
-        await db_service.update_analysis(analysis)
+        await get_db_service().update_analysis(analysis)
 
         # Update document
-        document.analysis_status = ProcessingStatus.COMPLETED
-        await db_service.update_document(document)
+        await get_db_service().update_document_fields(
+            analysis.document_id, analysis_status=ProcessingStatus.COMPLETED
+        )
 
         logger.info(f"Analysis completed: {analysis_id}, category={analysis.category}")
 
@@ -202,17 +298,16 @@ async def process_analysis_task(analysis_id: str):
         logger.error(f"Analysis processing failed for {analysis_id}: {e}", exc_info=True)
 
         # Update analysis status to failed
-        analysis = await db_service.get_analysis(analysis_id)
+        analysis = await get_db_service().get_analysis(analysis_id)
         if analysis:
             analysis.status = AnalysisStatus.FAILED
             analysis.error_message = str(e)
-            await db_service.update_analysis(analysis)
+            await get_db_service().update_analysis(analysis)
 
             # Update document
-            document = await db_service.get_document(analysis.document_id)
-            if document:
-                document.analysis_status = ProcessingStatus.FAILED
-                await db_service.update_document(document)
+            await get_db_service().update_document_fields(
+                analysis.document_id, analysis_status=ProcessingStatus.FAILED
+            )
 
 
 # =============================================================================
@@ -230,7 +325,7 @@ async def generate_pdf_task(document_id: str):
 
     try:
         # Get document
-        document = await db_service.get_document(document_id)
+        document = await get_db_service().get_document(document_id)
 
         if not document:
             logger.error(f"Document not found: {document_id}")
@@ -239,10 +334,10 @@ async def generate_pdf_task(document_id: str):
         # Get analysis if available
         analysis = None
         if document.analysis_id:
-            analysis = await db_service.get_analysis(document.analysis_id)
+            analysis = await get_db_service().get_analysis(document.analysis_id)
 
         # Generate PDF
-        pdf_bytes = await pdf_service.generate_pdf(
+        pdf_bytes = await get_pdf_service().generate_pdf(
             document=document,
             analysis=analysis,
             include_images=True
@@ -250,12 +345,12 @@ async def generate_pdf_task(document_id: str):
 
         # Save to storage
         pdf_key = f"{document_id}/export.pdf"
-        pdf_url = await storage_service.save_pdf(pdf_key, pdf_bytes)
+        pdf_url = await get_storage_service().save_pdf(pdf_key, pdf_bytes)
 
         # Update document
-        document.pdf_key = pdf_key
-        document.pdf_url = pdf_url
-        await db_service.update_document(document)
+        await get_db_service().update_document_fields(
+            document_id, pdf_key=pdf_key, pdf_url=pdf_url
+        )
 
         logger.info(f"PDF generated successfully: {pdf_key}")
 
@@ -322,24 +417,42 @@ async def check_pending_reminders():
     try:
         # Get reminders due now
         cutoff_time = datetime.utcnow()
-        reminders = await db_service.get_pending_reminders(cutoff_time)
+        reminders = await get_db_service().get_pending_reminders(cutoff_time)
 
         logger.info(f"Found {len(reminders)} pending reminders")
-
-        for reminder in reminders:
-            try:
-                # Send notification
-                await send_reminder_notification(reminder)
-
-                # Update reminder status
-                reminder.status = ReminderStatus.SENT
-                reminder.sent_at = datetime.utcnow()
-                await db_service.update_reminder(reminder)
-
-                logger.info(f"Reminder sent: {reminder.reminder_id}")
-
-            except Exception as e:
-                logger.error(f"Failed to send reminder {reminder.reminder_id}: {e}")
+        started = time.perf_counter()
+
+        # Reminders for the same document share one document read
+        _document_cache.set({})
+
+        # Reminders are independent: send them concurrently, bounded so a
+        # backlog doesn't flood the mail provider or DynamoDB
+        semaphore = asyncio.Semaphore(settings.REMINDER_MAX_CONCURRENCY)
+
+        async def process_reminder(reminder) -> bool:
+            async with semaphore:
+                try:
+                    # Send notification
+                    await send_reminder_notification(reminder)
+
+                    # Update reminder status
+                    reminder.status = ReminderStatus.SENT
+                    reminder.sent_at = datetime.utcnow()
+                    await get_db_service().update_reminder(reminder)
+
+                    logger.debug("Reminder sent: %s", reminder.reminder_id)
+                    return True
+
+                except Exception as e:
+                    logger.error(f"Failed to send reminder {reminder.reminder_id}: {e}")
+                    return False
+
+        # Per-reminder logs are DEBUG; one summary line per check at INFO
+        sent = await asyncio.gather(*(process_reminder(reminder) for reminder in reminders))
+        if reminders:
+            logger.info(
+                f"Sent {sum(sent)}/{len(reminders)} reminders in {time.perf_counter() - started:.2f}s"
+            )
 
     except Exception as e:
         logger.error(f"Failed to check reminders: {e}", exc_info=True)
@@ -354,10 +467,10 @@ async def send_reminder_notification(reminder):
 
     Note: This is a stub - implement actual notification logic based on settings.EMAIL_PROVIDER
     """
-    logger.info(f"Sending reminder notification: {reminder.title}")
+    logger.debug("Sending reminder notification: %s", reminder.title)
 
     # Get document for context
-    document = await db_service.get_document(reminder.document_id)
+    document = await get_document_cached(reminder.document_id)
 
     # Build notification message
     message = f"""
@@ -374,18 +487,18 @@ async def send_reminder_notification(reminder):
     # TODO: Implement actual notification based on settings
     if settings.EMAIL_PROVIDER == "ses":
         # Use AWS SES
-        logger.info("Would send via SES (not implemented in demo)")
+        logger.debug("Would send via %s (not implemented in demo)", "SES")
         pass
 
     elif settings.EMAIL_PROVIDER == "sendgrid":
         # Use SendGrid
-        logger.info("Would send via SendGrid (not implemented in demo)")
+        logger.debug("Would send via %s (not implemented in demo)", "SendGrid")
         pass
 
     elif settings.EMAIL_PROVIDER == "smtp":
         # Use SMTP
-        logger.info("Would send via SMTP (not implemented in demo)")
+        logger.debug("Would send via %s (not implemented in demo)", "SMTP")
         pass
 
     # For demo, just log
-    logger.info(f"Reminder notification (demo): {message}")
+    logger.debug("Reminder notification (demo): %s", message)
@@ -3,47 +3,49 @@ Create a test invoice image for testing PostMate
 
 Usage:
     python create_test_image.py
+    python create_test_image.py --count 500   # bulk, one worker process per core
 """
 
 from PIL import Image, ImageDraw, ImageFont
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+import argparse
+import io
 import os
 
+# Common font locations
+FONT_PATHS = [
+    "/System/Library/Fonts/Helvetica.ttc",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+    "C:\\Windows\\Fonts\\arial.ttf",  # Windows
+]
 
-def create_test_invoice():
-    """Create a sample invoice image"""
+
+@lru_cache(maxsize=None)
+def _get_font(size):
+    """Load a font at the given size once per process, falling back to default"""
+    for path in FONT_PATHS:
+        if os.path.exists(path):
+            try:
+                return ImageFont.truetype(path, size)
+            except OSError:
+                continue
+
+    print("Using default font (text may be small)")
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1)
+def _render_invoice(invoice_number="INV-2024-001"):
+    """Draw the invoice; only the invoice number varies"""
 
     # Create blank image
     img = Image.new('RGB', (800, 1100), color='white')
     draw = ImageDraw.Draw(img)
 
-    # Try to use a better font, fall back to default
-    try:
-        # Try common font locations
-        font_paths = [
-            "/System/Library/Fonts/Helvetica.ttc",  # macOS
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
-            "C:\\Windows\\Fonts\\arial.ttf",  # Windows
-        ]
-
-        font = None
-        for path in font_paths:
-            if os.path.exists(path):
-                try:
-                    font = ImageFont.truetype(path, 24)
-                    font_small = ImageFont.truetype(path, 16)
-                    font_large = ImageFont.truetype(path, 36)
-                    break
-                except:
-                    continue
-
-        if font is None:
-            raise Exception("No font found")
-
-    except:
-        print("Using default font (text may be small)")
-        font = ImageFont.load_default()
-        font_small = font
-        font_large = font
+    font = _get_font(24)
+    font_small = _get_font(16)
+    font_large = _get_font(36)
 
     # Draw invoice header
     draw.rectangle([(0, 0), (800, 100)], fill='#2C3E50')
@@ -61,7 +63,7 @@ def create_test_invoice():
 
     # Invoice details (right side)
     y = 120
-    draw.text((500, y), "Invoice #: INV-2024-001", fill='black', font=font)
+    draw.text((500, y), f"Invoice #: {invoice_number}", fill='black', font=font)
     y += 30
     draw.text((500, y), "Date: January 15, 2024", fill='#555', font=font_small)
     y += 25
@@ -131,14 +133,34 @@ def create_test_invoice():
     y = 1020
     draw.text((250, y), "Thank you for your business!", fill='#7F8C8D', font=font)
 
+    return img
+
+
+def _render_invoice_png(invoice_number="INV-2024-001"):
+    """Render the invoice as PNG bytes (runs in worker processes for bulk output)"""
+
+    # Flat colours and text: a 16-colour PNG is smaller than JPEG, lossless
+    # and faster to encode
+    buffer = io.BytesIO()
+    img = _render_invoice(invoice_number)
+    img.convert('P', palette=Image.ADAPTIVE, colors=16).save(buffer, format='PNG', optimize=False)
+    return buffer.getvalue()
+
+
+def create_test_invoice():
+    """Create a sample invoice image"""
+
+    img = _render_invoice()
+
     # Save
-    output_path = "tests/sample_data/test_invoice.jpg"
+    output_path = "tests/sample_data/test_invoice.png"
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    img.save(output_path, quality=95)
+    with open(output_path, 'wb') as f:
+        f.write(_render_invoice_png())
 
     print(f"✓ Test invoice image created: {output_path}")
     print(f"  Size: {img.size}")
-    print(f"  Format: JPEG")
+    print(f"  Format: PNG")
     print()
     print("You can now upload this image:")
     print(f"  curl -X POST http://localhost:8080/api/v1/upload -F 'files=@{output_path}'")
@@ -146,5 +168,38 @@ def create_test_invoice():
     return output_path
 
 
+def create_test_invoices(count, output_dir="tests/sample_data/invoices"):
+    """
+    Create many invoice images with distinct invoice numbers
+
+    Text rasterization holds the GIL, so invoices are rendered in a process
+    pool; only the PNG bytes come back to this process. Call this from
+    under `if __name__ == "__main__":` (worker processes re-import the module).
+    """
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(_render_invoice_png, f"INV-2024-{i:04d}"): i
+            for i in range(1, count + 1)
+        }
+        for future in as_completed(futures):
+            output_path = os.path.join(output_dir, f"test_invoice_{futures[future]:04d}.png")
+            with open(output_path, 'wb') as f:
+                f.write(future.result())
+
+    print(f"✓ {count} test invoice images created in {output_dir}")
+
+    return output_dir
+
+
 if __name__ == "__main__":
-    create_test_invoice()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1, help="Number of invoices to generate")
+    args = parser.parse_args()
+
+    if args.count > 1:
+        create_test_invoices(args.count)
+    else:
+        create_test_invoice()
@@ -4,12 +4,21 @@ AWS Lambda Handler - Reminder Scheduler
 Purpose: Check and send pending reminders (triggered by EventBridge)
 
 EventBridge Rule: Runs every 5 minutes
+
+SQS Trigger (optional): sqs_handler consumes the REMINDER_QUEUE_URL delay
+queue the API writes to. The API only enqueues reminders due within the 15
+minute SQS delay limit, so those are sent on time instead of on the next
+scan; later reminders are still sent by the scan. Both paths claim a
+reminder with a conditional update before sending it, so one picked up by
+both is sent once. Use batch size 10, ReportBatchItemFailures and a DLQ.
 """
 
 import json
 import boto3
+from boto3.dynamodb.types import TypeDeserializer
 import os
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 import sys
 
 # Add parent directory to path (for local testing)
@@ -19,11 +28,32 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../.
 DYNAMODB_TABLE_REMINDERS = os.environ.get('DYNAMODB_TABLE_REMINDERS', 'postmate-reminders-prod')
 DYNAMODB_TABLE_DOCUMENTS = os.environ.get('DYNAMODB_TABLE_DOCUMENTS', 'postmate-documents-prod')
 AWS_REGION = os.environ.get('AWS_REGION', 'us-east-1')
+REMINDER_QUEUE_URL = os.environ.get('REMINDER_QUEUE_URL')
+# Parallel scan segments; each segment is scanned by its own thread
+SCAN_SEGMENTS = int(os.environ.get('REMINDER_SCAN_SEGMENTS', '4'))
+# BatchGetItem accepts at most 100 keys per request
+BATCH_GET_MAX_KEYS = 100
+# SQS message delay limit
+SQS_MAX_DELAY_SECONDS = 900
 
 # Initialize clients
 dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
 reminders_table = dynamodb.Table(DYNAMODB_TABLE_REMINDERS)
 documents_table = dynamodb.Table(DYNAMODB_TABLE_DOCUMENTS)
+sqs = boto3.client('sqs', region_name=AWS_REGION)
+
+# Resources are not thread-safe, clients are: work fanned out to threads
+# goes through the resource's low-level client and deserializes the items
+dynamodb_client = dynamodb.meta.client
+_deserializer = TypeDeserializer()
+
+
+def _deserialize(item):
+    """
+    Convert a low-level client item ({'S': ...} values) to a plain dict
+    """
+
+    return {k: _deserializer.deserialize(v) for k, v in item.items()}
 
 
 def lambda_handler(event, context):
@@ -40,43 +70,31 @@ def lambda_handler(event, context):
         cutoff_time = datetime.utcnow().isoformat()
 
         # Scan for pending reminders that are due
-        response = reminders_table.scan(
-            FilterExpression='reminder_date <= :cutoff AND #status = :pending',
-            ExpressionAttributeValues={
-                ':cutoff': cutoff_time,
-                ':pending': 'pending'
-            },
-            ExpressionAttributeNames={
-                '#status': 'status'
-            }
-        )
-
-        reminders = response.get('Items', [])
+        reminders = scan_due_reminders(cutoff_time)
 
         print(f"Found {len(reminders)} pending reminders")
 
-        # Process each reminder
+        # Fetch each referenced document once up front
+        docs_by_id = get_documents({r['document_id'] for r in reminders})
+
+        # Process each reminder. Statuses are written one conditional
+        # update_item per reminder (mark_sent), not batched: BatchWriteItem
+        # takes no ConditionExpression, and an unconditional batch put would
+        # overwrite reschedules, edits and cancellations made during the run
         for reminder in reminders:
-            try:
-                send_reminder(reminder)
-
-                # Update reminder status
-                reminders_table.update_item(
-                    Key={'reminder_id': reminder['reminder_id']},
-                    UpdateExpression='SET #status = :sent, sent_at = :now',
-                    ExpressionAttributeValues={
-                        ':sent': 'sent',
-                        ':now': datetime.utcnow().isoformat()
-                    },
-                    ExpressionAttributeNames={
-                        '#status': 'status'
-                    }
-                )
+            # Claimed before sending, so a reminder the SQS path already
+            # picked up (or that changed since the scan) is skipped
+            sent_at = mark_sent(reminder)
+            if not sent_at:
+                continue
 
+            try:
+                send_reminder(reminder, docs_by_id)
                 print(f"Reminder sent: {reminder['reminder_id']}")
 
             except Exception as e:
                 print(f"Error sending reminder {reminder['reminder_id']}: {e}")
+                release_claim(reminder, sent_at)
 
         return {
             'statusCode': 200,
@@ -94,7 +112,261 @@ def lambda_handler(event, context):
         }
 
 
-def send_reminder(reminder):
+def sqs_handler(event, context):
+    """
+    Lambda handler for the reminder delay queue
+
+    Triggered by: SQS (REMINDER_QUEUE_URL). Each message carries a
+    reminder_id and the reminder_date it was scheduled for, and is delayed
+    until that date (the API only enqueues reminders due within 15 minutes).
+    """
+
+    failures = []
+
+    for record in event.get('Records', []):
+        try:
+            process_queued_reminder(json.loads(record['body']))
+        except Exception as e:
+            print(f"Error processing message {record.get('messageId')}: {e}")
+            failures.append({'itemIdentifier': record['messageId']})
+
+    # Only failed messages are retried (ReportBatchItemFailures)
+    return {'batchItemFailures': failures}
+
+
+def process_queued_reminder(message):
+    """
+    Send a queued reminder if it is due, otherwise re-enqueue it
+
+    Messages are delayed until the reminder is due, so re-enqueueing only
+    covers clock skew between the API and Lambda; it is bounded by the
+    15 minute enqueue window.
+    """
+
+    reminder_id = message['reminder_id']
+    reminder = reminders_table.get_item(Key={'reminder_id': reminder_id}).get('Item')
+
+    # Deleted, already sent/cancelled, or rescheduled (a newer message exists)
+    if (
+        not reminder
+        or reminder.get('status') != 'pending'
+        or reminder.get('reminder_date') != message.get('reminder_date')
+    ):
+        print(f"Dropping stale message for reminder {reminder_id}")
+        return
+
+    delay = _seconds_until(reminder['reminder_date'])
+    if delay > 0:
+        sqs.send_message(
+            QueueUrl=REMINDER_QUEUE_URL,
+            MessageBody=json.dumps(message),
+            DelaySeconds=min(SQS_MAX_DELAY_SECONDS, delay)
+        )
+        return
+
+    # Claimed before sending, so the scheduled scan can't send it as well
+    sent_at = mark_sent(reminder)
+    if not sent_at:
+        return
+
+    try:
+        send_reminder(reminder, get_documents({reminder['document_id']}))
+    except Exception:
+        # Back to pending so the retried message (or the scan) sends it
+        release_claim(reminder, sent_at)
+        raise
+
+    print(f"Reminder sent: {reminder_id}")
+
+
+def mark_sent(reminder):
+    """
+    Claim a reminder for sending by marking it sent, unless it changed
+    since it was read
+
+    Both delivery paths call this before sending: the update is
+    conditional on the reminder still being pending with the same
+    reminder_date, so only one of the scan and the SQS handler wins, and a
+    reschedule, edit or cancel made through the API is never overwritten.
+    A failed send hands the claim back (release_claim); if the Lambda dies
+    between claim and send the reminder is not sent (at most once).
+
+    Returns:
+        The sent_at timestamp written, or None if the reminder had changed
+    """
+
+    sent_at = datetime.utcnow().isoformat()
+
+    try:
+        reminders_table.update_item(
+            Key={'reminder_id': reminder['reminder_id']},
+            UpdateExpression='SET #status = :sent, sent_at = :now',
+            ConditionExpression='#status = :pending AND reminder_date = :date',
+            ExpressionAttributeValues={
+                ':sent': 'sent',
+                ':pending': 'pending',
+                ':date': reminder['reminder_date'],
+                ':now': sent_at
+            },
+            ExpressionAttributeNames={
+                '#status': 'status'
+            }
+        )
+        return sent_at
+    except dynamodb_client.exceptions.ConditionalCheckFailedException:
+        print(f"Reminder already claimed or changed: {reminder['reminder_id']}")
+        return None
+
+
+def release_claim(reminder, sent_at):
+    """
+    Return a claimed reminder to pending after its send failed
+
+    Conditional on the claim (sent_at) still being ours, so a reminder
+    edited or cancelled in the meantime is left alone.
+    """
+
+    try:
+        reminders_table.update_item(
+            Key={'reminder_id': reminder['reminder_id']},
+            UpdateExpression='SET #status = :pending REMOVE sent_at',
+            ConditionExpression='#status = :sent AND sent_at = :claimed',
+            ExpressionAttributeValues={
+                ':sent': 'sent',
+                ':pending': 'pending',
+                ':claimed': sent_at
+            },
+            ExpressionAttributeNames={
+                '#status': 'status'
+            }
+        )
+    except dynamodb_client.exceptions.ConditionalCheckFailedException:
+        print(f"Reminder changed after it was claimed: {reminder['reminder_id']}")
+    except Exception as e:
+        # Left marked sent; logged so it can be re-queued by hand
+        print(f"Error releasing reminder {reminder['reminder_id']}: {e}")
+
+
+def _seconds_until(reminder_date):
+    """
+    Whole seconds until an ISO reminder_date (naive values are UTC)
+    """
+
+    due = datetime.fromisoformat(reminder_date)
+    if due.tzinfo is not None:
+        due = due.astimezone(timezone.utc).replace(tzinfo=None)
+    return int((due - datetime.utcnow()).total_seconds())
+
+
+def _scan_segment(segment, total_segments, cutoff_time):
+    """
+    Scan one segment of the reminders table, following LastEvaluatedKey
+
+    A single scan call stops after 1 MB, so without paging reminders past
+    the first page would never be sent.
+    """
+
+    kwargs = {
+        'TableName': DYNAMODB_TABLE_REMINDERS,
+        'Segment': segment,
+        'TotalSegments': total_segments,
+        'FilterExpression': 'reminder_date <= :cutoff AND #status = :pending',
+        'ExpressionAttributeValues': {
+            ':cutoff': {'S': cutoff_time},
+            ':pending': {'S': 'pending'}
+        },
+        'ExpressionAttributeNames': {
+            '#status': 'status'
+        }
+    }
+
+    items = []
+    while True:
+        response = dynamodb_client.scan(**kwargs)
+        items.extend(_deserialize(item) for item in response.get('Items', []))
+
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return items
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def scan_due_reminders(cutoff_time):
+    """
+    Find all pending reminders due at or before cutoff_time
+
+    Runs a parallel scan: the table is split into SCAN_SEGMENTS segments
+    that are read concurrently (through the thread-safe client), each
+    paginated to the end.
+    """
+
+    total_segments = max(1, SCAN_SEGMENTS)
+
+    with ThreadPoolExecutor(max_workers=total_segments) as pool:
+        pages = pool.map(
+            lambda segment: _scan_segment(segment, total_segments, cutoff_time),
+            range(total_segments)
+        )
+        return [item for page in pages for item in page]
+
+
+def _get_documents_chunk(document_ids):
+    """
+    BatchGetItem one chunk of document IDs, retrying UnprocessedKeys
+    """
+
+    request = {
+        DYNAMODB_TABLE_DOCUMENTS: {
+            'Keys': [{'document_id': {'S': d}} for d in document_ids]
+        }
+    }
+
+    items = []
+    while request:
+        response = dynamodb_client.batch_get_item(RequestItems=request)
+        items.extend(
+            _deserialize(item)
+            for item in response.get('Responses', {}).get(DYNAMODB_TABLE_DOCUMENTS, [])
+        )
+        request = response.get('UnprocessedKeys')
+    return items
+
+
+def get_documents(document_ids):
+    """
+    Fetch documents by ID with BatchGetItem
+
+    Reminders often share a document, so this replaces one get_item per
+    reminder with one request per 100 distinct documents (chunks are
+    fetched concurrently through the thread-safe client).
+
+    Returns:
+        Dict of document_id -> document item (missing documents are absent)
+    """
+
+    document_ids = list(document_ids)
+    if not document_ids:
+        return {}
+
+    chunks = [
+        document_ids[i:i + BATCH_GET_MAX_KEYS]
+        for i in range(0, len(document_ids), BATCH_GET_MAX_KEYS)
+    ]
+
+    try:
+        with ThreadPoolExecutor(max_workers=len(chunks)) as pool:
+            return {
+                item['document_id']: item
+                for items in pool.map(_get_documents_chunk, chunks)
+                for item in items
+            }
+    except Exception as e:
+        # Document details only decorate the message; send without them
+        print(f"Error fetching documents: {e}")
+        return {}
+
+
+def send_reminder(reminder, docs_by_id):
     """
     Send reminder notification
 
@@ -102,13 +374,7 @@ def send_reminder(reminder):
     """
 
     # Get document info
-    try:
-        doc_response = documents_table.get_item(
-            Key={'document_id': reminder['document_id']}
-        )
-        document = doc_response.get('Item', {})
-    except:
-        document = {}
+    document = docs_by_id.get(reminder['document_id'], {})
 
     # Build notification message
     message = f"""
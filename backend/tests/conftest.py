@@ -3,22 +3,38 @@ Pytest configuration and fixtures
 """
 
 import pytest
+import pytest_asyncio
 import os
 import sys
 
 # Add app to path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
+import httpx
 from fastapi.testclient import TestClient
 from app.main import app
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def client():
-    """FastAPI test client"""
+    """FastAPI test client, shared by the whole session (requests carry no client state)"""
     return TestClient(app)
 
 
+@pytest_asyncio.fixture
+async def aclient():
+    """
+    Async client calling the ASGI app in-process (for async tests)
+
+    No TestClient thread bridging per request. Created per test on the
+    test's own event loop (cheap: no app startup) and closed afterwards.
+    """
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as c:
+        yield c
+
+
 @pytest.fixture
 def sample_textract_response():
     """Sample Textract API response for testing"""
@@ -3,7 +3,11 @@ Test LLM prompt formatting and JSON validation
 """
 
 import pytest
+import asyncio
+import io
 import json
+import threading
+from app.config import settings
 from app.services.llm import LLMService
 
 
@@ -59,6 +63,23 @@ def test_extract_json_from_plain_markdown():
     assert result["category"] == "letter"
 
 
+def test_extract_json_after_prose_with_braces():
+    """Test that a fenced block wins over braces in the prose before it"""
+
+    service = LLMService()
+
+    response = """Note: {amount} was unclear, using the total instead.
+
+```json
+{"category": "invoice", "confidence": 0.9, "key_entities": {"total": "$42.00"}}
+```"""
+
+    result = service._extract_json_from_response(response)
+
+    assert result["category"] == "invoice"
+    assert result["key_entities"] == {"total": "$42.00"}
+
+
 def test_chunk_and_token_counting():
     """Test text chunking by token count"""
 
@@ -158,5 +179,58 @@ def test_analysis_result_schema_validation(sample_llm_analysis_response):
         f"Category '{result['category']}' not in valid list"
 
 
+@pytest.mark.asyncio
+async def test_bedrock_calls_overlap():
+    """Test that Bedrock calls run off the event loop and overlap"""
+
+    # Each call waits for the other inside invoke_model; if the calls ran
+    # on the event loop (one at a time), the barrier would time out
+    barrier = threading.Barrier(2, timeout=5)
+
+    class FakeBedrockClient:
+        def invoke_model(self, modelId, body):
+            barrier.wait()
+            payload = json.dumps({"content": [{"text": "ok"}]}).encode()
+            return {"body": io.BytesIO(payload)}
+
+    service = LLMService()
+    service.bedrock_client = FakeBedrockClient()
+
+    results = await asyncio.gather(
+        service._call_bedrock("first"),
+        service._call_bedrock_chat([{"role": "user", "content": "second"}]),
+    )
+
+    assert results == ["ok", "ok"]
+
+
+@pytest.mark.asyncio
+async def test_chunk_and_summarize_bounds_concurrency(monkeypatch):
+    """Test that summary and merge calls share the LLM_MAX_CONCURRENCY limit"""
+
+    monkeypatch.setattr(settings, "LLM_MAX_CONCURRENCY", 2)
+    service = LLMService()
+
+    in_flight = 0
+    peak = 0
+    merges = 0
+
+    async def fake_call_llm(prompt):
+        nonlocal in_flight, peak, merges
+        merges += "\n\n" in prompt
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return "Summary of this part of the document. " * 10
+
+    monkeypatch.setattr(service, "_call_llm", fake_call_llm)
+
+    await service.chunk_and_summarize("This is a sentence. " * 2000, max_tokens=200)
+
+    assert merges > 2, "Expected several merge calls"
+    assert peak == 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,86 @@
+"""
+Test PDF generation caching
+"""
+
+import pytest
+from datetime import datetime
+
+from app.models.analysis import Analysis
+from app.models.document import Document, ProcessingStatus
+from app.services.pdfgen import PDFGenService
+
+
+def _document(**overrides):
+    fields = dict(
+        document_id="doc_test",
+        uploaded_at=datetime(2024, 1, 15, 10, 0, 0),
+        processed_at=datetime(2024, 1, 15, 10, 1, 0),
+        image_urls=["/storage/doc_test/image_1.jpg"],
+        image_count=1,
+        page_count=1,
+        ocr_status=ProcessingStatus.COMPLETED,
+        ocr_text="INVOICE\n\nTotal: $1,250.00",
+        ocr_confidence=97.5,
+    )
+    fields.update(overrides)
+    return Document(**fields)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    """PDF service that counts real renders"""
+    service = PDFGenService()
+    service.renders = 0
+    build = service._build_pdf_sync
+
+    def counting_build(*args):
+        service.renders += 1
+        return build(*args)
+
+    monkeypatch.setattr(service, "_build_pdf_sync", counting_build)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_pdf_cache_hit(service):
+    """Test that an unchanged document is served from the cache"""
+    first = await service.generate_pdf(_document())
+    second = await service.generate_pdf(_document())
+
+    assert second == first
+    assert service.renders == 1
+
+
+@pytest.mark.asyncio
+async def test_pdf_cache_ignores_unrendered_fields(service):
+    """Test that saving the PDF location doesn't invalidate the cache"""
+    await service.generate_pdf(_document())
+    await service.generate_pdf(_document(pdf_key="doc_test.pdf", pdf_url="/pdfs/doc_test.pdf"))
+
+    assert service.renders == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("change", [
+    {"ocr_confidence": 88.0},
+    {"ocr_status": ProcessingStatus.FAILED},
+    {"page_count": 2},
+    {"ocr_text": "RECEIPT"},
+])
+async def test_pdf_cache_miss_on_rendered_field(service, change):
+    """Test that changing any rendered document field renders a new PDF"""
+    await service.generate_pdf(_document())
+    await service.generate_pdf(_document(**change))
+
+    assert service.renders == 2
+
+
+@pytest.mark.asyncio
+async def test_pdf_cache_miss_on_analysis_change(service):
+    """Test that an updated analysis renders a new PDF"""
+    analysis = Analysis(analysis_id="analysis_test", document_id="doc_test", summary="Invoice")
+
+    await service.generate_pdf(_document(), analysis)
+    await service.generate_pdf(_document(), analysis.model_copy(update={"summary": "Paid invoice"}))
+
+    assert service.renders == 2
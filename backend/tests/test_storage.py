@@ -0,0 +1,256 @@
+"""
+Test storage service I/O (local mode and S3 against a stubbed client)
+"""
+
+import io
+import os
+import stat
+import tempfile
+
+import pytest
+from botocore.exceptions import ClientError
+
+from app.config import settings
+from app.services import storage as storage_module
+from app.services.storage import StorageService
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+class FakeBody:
+    """Minimal StreamingBody"""
+
+    def __init__(self, data: bytes):
+        self._data = data
+
+    def read(self):
+        return self._data
+
+    def iter_chunks(self, chunk_size=1024):
+        for i in range(0, len(self._data), chunk_size):
+            yield self._data[i:i + chunk_size]
+
+
+class FakeS3:
+    """In-memory stand-in for the boto3 S3 client"""
+
+    def __init__(self):
+        self.objects = {}
+        self.gets = []
+        self.delete_batches = []
+        self.delete_errors = set()
+        self.signed = 0
+        self.after_get = None
+
+    def put(self, key, data):
+        self.objects[key] = (data, f'"etag-{len(self.gets)}-{len(data)}"')
+
+    def get_object(self, Bucket, Key, Range, IfMatch=None):
+        self.gets.append({'Range': Range, 'IfMatch': IfMatch})
+        data, etag = self.objects[Key]
+
+        if IfMatch is not None and IfMatch != etag:
+            raise ClientError({'Error': {'Code': 'PreconditionFailed'}}, 'GetObject')
+
+        start, end = (int(x) for x in Range[len('bytes='):].split('-'))
+        if start >= len(data):
+            raise ClientError({'Error': {'Code': 'InvalidRange'}}, 'GetObject')
+        end = min(end, len(data) - 1)
+
+        response = {
+            'Body': FakeBody(data[start:end + 1]),
+            'ContentRange': f"bytes {start}-{end}/{len(data)}",
+            'ETag': etag,
+        }
+        if self.after_get:
+            self.after_get()
+        return response
+
+    def delete_objects(self, Bucket, Delete):
+        keys = [obj['Key'] for obj in Delete['Objects']]
+        self.delete_batches.append(len(keys))
+        return {
+            'Errors': [
+                {'Key': key, 'Message': 'Access Denied'}
+                for key in keys if key in self.delete_errors
+            ]
+        }
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn):
+        self.signed += 1
+        return f"https://s3.example/{Params['Key']}?expires={ExpiresIn}&n={self.signed}"
+
+
+@pytest.fixture
+def local_storage(tmp_path, monkeypatch):
+    """Storage service writing under a temporary directory"""
+    monkeypatch.setattr(settings, "USE_LOCAL_STORAGE", True)
+    monkeypatch.setattr(settings, "LOCAL_STORAGE_PATH", str(tmp_path))
+    return StorageService()
+
+
+@pytest.fixture
+def s3():
+    return FakeS3()
+
+
+@pytest.fixture
+def s3_storage(s3, monkeypatch):
+    """Storage service in S3 mode with small chunks, backed by FakeS3"""
+    monkeypatch.setattr(settings, "USE_LOCAL_STORAGE", False)
+    monkeypatch.setattr(storage_module, "get_client", lambda service_name: s3)
+    # Small chunks so multi-range reads need only a few bytes
+    monkeypatch.setattr(storage_module, "_MULTIPART_CHUNK_SIZE", 16)
+    monkeypatch.setattr(storage_module, "_MAX_RANGE_REQUESTS", 3)
+    return StorageService()
+
+
+def _temp_files(directory):
+    return [name for name in os.listdir(directory) if name.startswith('.tmp-')]
+
+
+# =============================================================================
+# LOCAL STORAGE
+# =============================================================================
+
+@pytest.mark.asyncio
+async def test_local_save_and_read(local_storage):
+    """Test that a saved image reads back with normal permissions"""
+    data = os.urandom(4096)
+
+    path = await local_storage.save_image("doc_test/image_1.jpg", data)
+
+    assert await local_storage.get_image("doc_test/image_1.jpg") == data
+    # Written via mkstemp (0600) then chmod'ed before the atomic replace
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert _temp_files(os.path.dirname(path)) == []
+
+
+@pytest.mark.asyncio
+async def test_local_failed_write_keeps_previous_file(local_storage):
+    """Test that a failed write leaves the old file and no temp file behind"""
+
+    class FailingReader(io.BytesIO):
+        def read(self, *args):
+            raise IOError("client disconnected")
+
+    path = await local_storage.save_image("doc_test/image_1.jpg", b"original")
+
+    with pytest.raises(IOError):
+        await local_storage.save_image_fileobj("doc_test/image_1.jpg", FailingReader(b"new"))
+
+    assert await local_storage.get_image("doc_test/image_1.jpg") == b"original"
+    assert _temp_files(os.path.dirname(path)) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("spool_max_size", [1 << 20, 16], ids=["in_memory", "rolled_to_disk"])
+async def test_local_save_from_spooled_file(local_storage, spool_max_size):
+    """Test streaming an upload from both in-memory and on-disk spooled files"""
+    data = os.urandom(100_000)
+    upload = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
+    upload.write(data)
+    upload.seek(0)
+
+    await local_storage.save_image_fileobj("doc_test/image_1.png", upload)
+
+    assert await local_storage.get_image("doc_test/image_1.png") == data
+    # An in-memory upload must not be forced to disk by the copy
+    assert (upload.name is None) == (spool_max_size > len(data))
+
+
+@pytest.mark.asyncio
+async def test_local_delete_files(local_storage):
+    """Test batch delete reports missing files as not deleted"""
+    await local_storage.save_image("doc_test/image_1.jpg", b"x")
+
+    results = await local_storage.delete_files(
+        ["images/doc_test/image_1.jpg", "images/doc_test/missing.jpg"]
+    )
+
+    assert results == {
+        "images/doc_test/image_1.jpg": True,
+        "images/doc_test/missing.jpg": False,
+    }
+
+
+# =============================================================================
+# S3 STORAGE
+# =============================================================================
+
+@pytest.mark.asyncio
+async def test_s3_get_small_object_single_request(s3_storage, s3):
+    """Test that an object within one chunk is read with a single GET"""
+    s3.put("images/doc_test/image_1.jpg", b"tiny")
+
+    assert await s3_storage.get_image("doc_test/image_1.jpg") == b"tiny"
+    assert len(s3.gets) == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [17, 100, 1000])
+async def test_s3_get_multi_range_reassembly(s3_storage, s3, size):
+    """Test that ranged GETs reassemble the object in order"""
+    data = os.urandom(size)
+    s3.put("images/doc_test/image_1.jpg", data)
+
+    content = await s3_storage.get_image("doc_test/image_1.jpg")
+
+    assert bytes(content) == data
+    # First GET probes the size; the rest are capped and pinned to the ETag
+    assert len(s3.gets) <= 1 + storage_module._MAX_RANGE_REQUESTS
+    etag = s3.objects["images/doc_test/image_1.jpg"][1]
+    assert all(get['IfMatch'] == etag for get in s3.gets[1:])
+
+
+@pytest.mark.asyncio
+async def test_s3_get_empty_object(s3_storage, s3):
+    """Test that the InvalidRange error for an empty object reads as b''"""
+    s3.put("pdfs/doc_test.pdf", b"")
+
+    assert await s3_storage.get_pdf("doc_test.pdf") == b""
+
+
+@pytest.mark.asyncio
+async def test_s3_get_object_replaced_mid_read(s3_storage, s3):
+    """Test that a read spanning an overwrite fails instead of mixing versions"""
+    key = "images/doc_test/image_1.jpg"
+    s3.put(key, os.urandom(100))
+
+    def overwrite():
+        s3.after_get = None
+        s3.put(key, os.urandom(100))
+
+    s3.after_get = overwrite
+
+    with pytest.raises(ClientError) as exc_info:
+        await s3_storage.get_image("doc_test/image_1.jpg")
+
+    assert exc_info.value.response['Error']['Code'] == 'PreconditionFailed'
+
+
+@pytest.mark.asyncio
+async def test_s3_delete_files_batches(s3_storage, s3):
+    """Test that deletes go out in DeleteObjects batches of at most 1000 keys"""
+    keys = [f"images/doc_{i}/image_1.jpg" for i in range(2500)]
+    s3.delete_errors = {keys[1500]}
+
+    results = await s3_storage.delete_files(keys)
+
+    assert s3.delete_batches == [1000, 1000, 500]
+    assert results[keys[1500]] is False
+    assert sum(results.values()) == 2499
+
+
+@pytest.mark.asyncio
+async def test_s3_presigned_url_cached(s3_storage, s3):
+    """Test that presigned URLs are reused per key and expiry"""
+    first = await s3_storage.get_presigned_url("images/doc_test/image_1.jpg", expiry=3600)
+    second = await s3_storage.get_presigned_url("images/doc_test/image_1.jpg", expiry=3600)
+    other = await s3_storage.get_presigned_url("images/doc_test/image_1.jpg", expiry=60)
+
+    assert second == first
+    assert other != first
+    assert s3.signed == 2
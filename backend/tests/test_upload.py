@@ -7,13 +7,21 @@ import io
 from PIL import Image
 
 
-def create_test_image():
-    """Create a simple test image in memory"""
-    img = Image.new('RGB', (100, 100), color='white')
+def _encode_test_jpeg(color='white'):
+    """Encode a simple 100x100 single-colour JPEG"""
+    img = Image.new('RGB', (100, 100), color=color)
     img_bytes = io.BytesIO()
     img.save(img_bytes, format='JPEG')
-    img_bytes.seek(0)
-    return img_bytes
+    return img_bytes.getvalue()
+
+
+# Encoded once per module; each test gets its own file object over it
+_JPEG_BYTES = _encode_test_jpeg()
+
+
+def create_test_image():
+    """Create a simple test image in memory"""
+    return io.BytesIO(_JPEG_BYTES)
 
 
 def test_health_check(client):
@@ -76,19 +84,61 @@ def test_upload_multiple_images(client):
     assert data["uploaded_files"] == 2
 
 
-def test_upload_no_files(client):
+def test_upload_duplicate_images_stored_once(client, monkeypatch):
+    """Test that identical files in one upload are stored and counted once"""
+    from app.api.v1 import upload
+
+    saved_keys = []
+    saved_documents = []
+
+    async def save_image_fileobj(key, fileobj, content_type="image/jpeg"):
+        saved_keys.append(key)
+        return f"/storage/images/{key}"
+
+    async def save_document(document):
+        saved_documents.append(document)
+
+    monkeypatch.setattr(upload.storage_service, "save_image_fileobj", save_image_fileobj)
+    monkeypatch.setattr(upload.db_service, "save_document", save_document)
+
+    test_images = [
+        ("page1.jpg", create_test_image(), "image/jpeg"),
+        ("page1_again.jpg", create_test_image(), "image/jpeg"),
+        ("page2.jpg", io.BytesIO(_encode_test_jpeg(color='black')), "image/jpeg"),
+    ]
+
+    response = client.post(
+        "/api/v1/upload",
+        files=[("files", img) for img in test_images]
+    )
+
+    assert response.status_code == 201
+    assert response.json()["uploaded_files"] == 3
+
+    # The repeat is neither stored nor kept as a page for OCR
+    document_id = response.json()["document_id"]
+    assert saved_keys == [f"{document_id}/image_1.jpg", f"{document_id}/image_2.jpg"]
+
+    document, = saved_documents
+    assert document.image_keys == saved_keys
+    assert document.image_count == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_no_files(aclient):
     """Test upload with no files"""
-    response = client.post("/api/v1/upload", files={})
+    response = await aclient.post("/api/v1/upload", files={})
 
     assert response.status_code == 422  # Validation error
 
 
-def test_upload_invalid_format(client):
+@pytest.mark.asyncio
+async def test_upload_invalid_format(aclient):
     """Test upload with invalid file format"""
     # Create a text file
     text_file = io.BytesIO(b"Not an image")
 
-    response = client.post(
+    response = await aclient.post(
         "/api/v1/upload",
         files={"files": ("test.txt", text_file, "text/plain")}
     )
@@ -97,9 +147,10 @@ def test_upload_invalid_format(client):
     assert response.status_code == 400
 
 
-def test_get_document_status_not_found(client):
+@pytest.mark.asyncio
+async def test_get_document_status_not_found(aclient):
     """Test getting status for non-existent document"""
-    response = client.get("/api/v1/documents/invalid_id/status")
+    response = await aclient.get("/api/v1/documents/invalid_id/status")
 
     assert response.status_code == 404
     assert "not found" in response.json()["detail"].lower()